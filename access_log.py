@@ -0,0 +1,160 @@
+import asyncio
+import json
+import random
+import sys
+import time
+from datetime import datetime, timezone
+
+
+class AccessLog:
+    """Buffered JSON access log written by a background task.
+
+    Requests only append a record to a bounded queue; a background task
+    serializes and writes them in batches. When the queue is full, records
+    are dropped (and counted) instead of slowing requests down. Successful
+    static file requests are sampled at `static_sample_rate`, and each of
+    their records carries that rate so counts can be scaled back up.
+    """
+
+    def __init__(self, path=None, max_queue=10000, batch_size=500, flush_interval=1.0, static_sample_rate=0.1):
+        """Initialize the log; `path` None writes to stdout."""
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.static_sample_rate = static_sample_rate
+        self._queue = asyncio.Queue(maxsize=max_queue)
+        self._stream = None
+        self._task = None
+        self._writing = None
+        self.written = 0
+        self.dropped = 0
+        self.sampled_out = 0
+
+    def record(self, entry):
+        """Queue a record for writing, without ever blocking."""
+        if entry["path"].startswith("/static/") and entry["status"] < 400:
+            if random.random() >= self.static_sample_rate:
+                self.sampled_out += 1
+                return
+            entry["sample_rate"] = self.static_sample_rate
+        try:
+            self._queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def _take_batch(self):
+        batch = []
+        while len(batch) < self.batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    def _write(self, batch):
+        """Serialize and write a batch of records (blocking)."""
+        lines = []
+        for entry in batch:
+            entry["time"] = datetime.fromtimestamp(entry["time"], timezone.utc).isoformat(timespec="milliseconds")
+            lines.append(json.dumps(entry, separators=(",", ":")) + "\n")
+        data = "".join(lines)
+        self._stream.write(data)
+        self._stream.flush()
+        self.written += len(batch)
+
+    async def run(self):
+        """Write queued records until cancelled."""
+        while True:
+            batch = [await self._queue.get()]
+            batch.extend(self._take_batch())
+            # Shielded, so stopping waits for a batch that is being written
+            self._writing = asyncio.ensure_future(asyncio.to_thread(self._write, batch))
+            try:
+                await asyncio.shield(self._writing)
+            except (OSError, ValueError) as e:
+                print(f"Error writing access log: {e}")
+            if len(batch) < self.batch_size:
+                # Let the next batch build up; a full one means records are
+                # coming in faster than that, so keep writing
+                await asyncio.sleep(self.flush_interval)
+
+    async def start(self):
+        """Open the log and start the background writer."""
+        if self._task is None:
+            self._stream = open(self.path, "a", encoding="utf-8") if self.path else sys.stdout
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """Stop the background writer and write what is still queued."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._writing is not None:
+            # Errors of that write are reported by run()
+            await asyncio.wait({self._writing})
+            self._writing = None
+
+        while batch := self._take_batch():
+            await asyncio.to_thread(self._write, batch)
+        if self._stream is not sys.stdout:
+            self._stream.close()
+
+    def stats(self):
+        """Return the log counters."""
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "sampled_out": self.sampled_out,
+            "queued": self._queue.qsize(),
+        }
+
+
+class AccessLogMiddleware:
+    """Records one access log entry per HTTP request.
+
+    Handlers can report whether they were served from a cache by setting
+    `request.state.cache` (e.g. "hit" or "miss").
+    """
+
+    def __init__(self, app, access_log):
+        self.app = app
+        self.access_log = access_log
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            state = scope.get("state", {})
+            route = scope.get("route")
+            # Prefetches and prerenders aren't page views (yet)
+            purpose = next((value.decode("latin-1") for name, value in scope["headers"] if name == b"sec-purpose"), None)
+            self.access_log.record({
+                "time": time.time(),
+                "method": scope["method"],
+                "path": scope.get("raw_path", b"").decode("latin-1") or scope["path"],
+                "route": getattr(route, "path", None),
+                "lang": state.get("language"),
+                "status": status,
+                "bytes": size,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                "cache": state.get("cache"),
+                "purpose": purpose,
+            })
@@ -0,0 +1,195 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PasswordHasher:
+    """scrypt password hashing on a small, dedicated thread pool.
+
+    Hashing is deliberately slow, so it never runs on the event loop; with
+    at most `max_workers` hashes in progress, at the lowest thread priority,
+    a burst of logins can't take CPU time from page rendering either. At
+    most `max_pending` checks wait for the pool; `busy()` tells when more
+    should be turned away. Hashes are stored as
+    `scrypt$<n>$<r>$<p>$<salt>$<hash>`.
+    """
+
+    def __init__(self, n=2 ** 14, r=8, p=1, max_workers=2, max_pending=64):
+        """Initialize the hasher with its scrypt cost parameters."""
+        self.n = n
+        self.r = r
+        self.p = p
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="password-hash",
+            initializer=self._lower_priority
+        )
+        # Verified against when the user doesn't exist, so that takes as long
+        self._dummy_hash = self.hash(secrets.token_urlsafe(16))
+
+    @staticmethod
+    def _lower_priority():
+        # Let the event loop thread win the CPU over a hash when they compete
+        # (Linux sets the nice value per thread)
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        except (AttributeError, OSError):
+            pass
+
+    def _derive(self, password, salt, n, r, p):
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=2 * 128 * r * n, dklen=32)
+
+    def hash(self, password):
+        """Hash a password (blocking)."""
+        salt = os.urandom(16)
+        key = self._derive(password, salt, self.n, self.r, self.p)
+        encoded_salt = base64.b64encode(salt).decode()
+        encoded_key = base64.b64encode(key).decode()
+        return f"scrypt${self.n}${self.r}${self.p}${encoded_salt}${encoded_key}"
+
+    def _check(self, password, password_hash):
+        try:
+            scheme, n, r, p, salt, key = password_hash.split("$")
+            if scheme != "scrypt":
+                return False
+            derived = self._derive(password, base64.b64decode(salt), int(n), int(r), int(p))
+        except ValueError:
+            return False
+        return hmac.compare_digest(derived, base64.b64decode(key))
+
+    def verify(self, password, password_hash):
+        """Check a password against a stored hash, or None for an unknown user (blocking)."""
+        if password_hash is None:
+            # Take as long as a real check, so unknown emails can't be told apart
+            self._check(password, self._dummy_hash)
+            return False
+        return self._check(password, password_hash)
+
+    def busy(self):
+        """Whether `max_pending` checks are already waiting for the pool."""
+        return self.pending >= self.max_pending
+
+    async def verify_async(self, password, password_hash):
+        """Check a password on the hashing pool."""
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        try:
+            return await loop.run_in_executor(self.executor, self.verify, password, password_hash)
+        finally:
+            self.pending -= 1
+
+    def shutdown(self):
+        """Stop the hashing pool."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class AuthStore:
+    """Users and sessions in a local SQLite database.
+
+    Sessions are keyed by the SHA-256 of their token, so the database never
+    holds a usable token. Recently used sessions are kept in an LRU in
+    memory, so most requests don't touch the database.
+    """
+
+    def __init__(self, db_path, session_ttl=14 * 24 * 3600, cache_size=1024):
+        """Open (and if needed create) the database."""
+        self.db_path = db_path
+        self.session_ttl = session_ttl
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS users ("
+            "email TEXT PRIMARY KEY, password_hash TEXT NOT NULL) WITHOUT ROWID"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "token BLOB PRIMARY KEY, email TEXT NOT NULL, expires INTEGER NOT NULL) WITHOUT ROWID"
+        )
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _token_key(token):
+        return hashlib.sha256(token.encode()).digest()
+
+    def _remember(self, key, email, expires):
+        with self._cache_lock:
+            self._cache[key] = (email, expires)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def set_password(self, email, password_hash):
+        """Create a user or replace their password hash."""
+        self._execute(
+            "INSERT INTO users (email, password_hash) VALUES (?, ?) "
+            "ON CONFLICT(email) DO UPDATE SET password_hash = excluded.password_hash",
+            (email.lower(), password_hash)
+        )
+
+    def password_hash(self, email):
+        """Return the password hash of a user, or None if there is no such user."""
+        rows = self._execute("SELECT password_hash FROM users WHERE email = ?", (email.lower(),))
+        return rows[0][0] if rows else None
+
+    def create_session(self, email):
+        """Start a session for a user and return its token."""
+        token = secrets.token_urlsafe(32)
+        key = self._token_key(token)
+        expires = int(time.time()) + self.session_ttl
+        self._execute("INSERT INTO sessions (token, email, expires) VALUES (?, ?, ?)", (key, email.lower(), expires))
+        self._remember(key, email.lower(), expires)
+        return token
+
+    def session_user(self, token):
+        """Return the email of the session's user, or None if it is unknown or expired."""
+        if not token:
+            return None
+        key = self._token_key(token)
+        with self._cache_lock:
+            entry = self._cache.get(key)
+        if entry is None:
+            rows = self._execute("SELECT email, expires FROM sessions WHERE token = ?", (key,))
+            if not rows:
+                return None
+            entry = rows[0]
+        email, expires = entry
+        if expires < time.time():
+            self.delete_session(token)
+            return None
+        self._remember(key, email, expires)
+        return email
+
+    def delete_session(self, token):
+        """End a session."""
+        key = self._token_key(token)
+        with self._cache_lock:
+            self._cache.pop(key, None)
+        self._execute("DELETE FROM sessions WHERE token = ?", (key,))
+
+    def purge_expired(self):
+        """Delete all expired sessions from the database."""
+        self._execute("DELETE FROM sessions WHERE expires < ?", (int(time.time()),))
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import urllib.request
+from urllib.parse import quote
+
+
+def page_keys(lang, data_names=()):
+    """Surrogate keys of a page rendered in `lang` from the given data files."""
+    return ["page", f"page:{lang}", f"translations:{lang}", *(f"data:{name}" for name in data_names)]
+
+
+def static_file_keys(rel_path):
+    """Surrogate keys of a file in public/, e.g. "public/data/reviews.json"."""
+    path = rel_path.removeprefix("public/")
+    keys = ["static", f"static:{quote(path)}"]
+    if path.startswith("data/") and path.endswith(".json"):
+        keys.append(f"data:{path.removeprefix('data/').removesuffix('.json')}")
+    return keys
+
+
+def surrogate_headers(keys):
+    """Tag a response with keys, for CDNs that read Surrogate-Key or Cache-Tag."""
+    return {
+        "Surrogate-Key": " ".join(keys),
+        "Cache-Tag": ",".join(keys),
+    }
+
+
+def changed_keys(old, new):
+    """Keys to purge when moving from snapshot `old` to snapshot `new`."""
+    keys = set()
+    for lang in set(old.translations) | set(new.translations):
+        if old.translations.get(lang) != new.translations.get(lang):
+            keys.add(f"translations:{lang}")
+    for name in set(old.data) | set(new.data):
+        if old.data.get(name) != new.data.get(name):
+            keys.add(f"data:{name}")
+    # Case study pages are purged one by one
+    for slug in set(old.cases) | set(new.cases):
+        if old.cases.get(slug) != new.cases.get(slug):
+            keys.add(f"case:{slug}")
+
+    for rel_path in set(old.file_versions) | set(new.file_versions):
+        if old.file_versions.get(rel_path) != new.file_versions.get(rel_path):
+            keys.add(static_file_keys(rel_path)[1])
+            # Pages link to files by their versioned URLs
+            keys.add("page")
+    return keys
+
+
+class CDNPurger:
+    """Purges surrogate keys at the CDN after the content changes.
+
+    Purges are sent as `POST purge_url` with a JSON body `{"keys": [...]}`
+    and, if a token is given, an `Authorization: Bearer` header; a small
+    proxy or worker translates that to the CDN's own purge API.
+    """
+
+    def __init__(self, purge_url, snapshot, token=None, timeout=10, batch_size=256):
+        """Initialize the purger with the snapshot the CDN currently caches."""
+        self.purge_url = purge_url
+        self.token = token
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self._snapshot = snapshot
+        self.purged = 0
+        self.failed = 0
+
+    def purge(self, keys):
+        """Purge keys at the CDN (blocking)."""
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        for start in range(0, len(keys), self.batch_size):
+            batch = keys[start:start + self.batch_size]
+            request = urllib.request.Request(
+                self.purge_url,
+                data=json.dumps({"keys": batch}).encode(),
+                headers=headers,
+                method="POST"
+            )
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+            self.purged += len(batch)
+
+    async def after_reload(self, snapshot):
+        """Purge what changed since the previous snapshot, once the new one is live."""
+        keys = sorted(changed_keys(self._snapshot, snapshot))
+        self._snapshot = snapshot
+        if not keys:
+            return
+        try:
+            await asyncio.to_thread(self.purge, keys)
+        except OSError as e:
+            # The CDN keeps the old content until its TTL runs out
+            print(f"Error purging {len(keys)} CDN keys: {e}")
+            self.failed += 1
+
+    def stats(self):
+        """Return the purge counters."""
+        return {
+            "purged_keys": self.purged,
+            "failures": self.failed,
+        }
@@ -0,0 +1,80 @@
+from fasthtml.common import *
+from leads import LEAD_FIELDS, HONEYPOT_FIELD
+
+class ContactForm:
+    """Contact and demo request form component for the Teambee application."""
+
+    input_cls = "w-full px-3 py-2 bg-[#F8F7FB] border border-gray-300 rounded-lg focus-visible:outline-none focus-visible:ring-2 focus-visible:ring-[#3D2E7C] focus-visible:border-[#3D2E7C] aria-[invalid=true]:border-red-500"
+
+    def __init__(self, get_text, action="/contact"):
+        """Initialize the contact form with a function returning its texts."""
+        self.get_text = get_text
+        self.action = action
+
+    def _field(self, name, type="text", required=True, autocomplete=None):
+        """Render a labelled input."""
+        return Div(
+            Label(self.get_text(name), for_=f"contact-{name}", cls="block text-sm font-medium text-gray-700 mb-1"),
+            Input(type=type, id=f"contact-{name}", name=name, required=required,
+                  maxlength=LEAD_FIELDS[name], autocomplete=autocomplete,
+                  cls=self.input_cls),
+            cls="flex flex-col gap-2"
+        )
+
+    def render(self):
+        """Render the contact form."""
+        return Form(
+            Div(
+                Div(
+                    self._field("name", autocomplete="name"),
+                    self._field("email", type="email", autocomplete="email"),
+                    cls="grid gap-6 md:grid-cols-2"
+                ),
+
+                Div(
+                    self._field("club", autocomplete="organization"),
+                    self._field("phone", type="tel", required=False, autocomplete="tel"),
+                    cls="grid gap-6 md:grid-cols-2"
+                ),
+
+                Div(
+                    Label(self.get_text("message"), for_="contact-message", cls="block text-sm font-medium text-gray-700 mb-1"),
+                    Textarea(id="contact-message", name="message", rows=4, maxlength=LEAD_FIELDS["message"],
+                             cls=self.input_cls),
+                    cls="flex flex-col gap-2"
+                ),
+
+                # Left empty by people; bots that fill in every field are ignored
+                Div(
+                    Label("Website", for_="contact-website"),
+                    Input(type="text", id="contact-website", name=HONEYPOT_FIELD, tabindex="-1", autocomplete="off"),
+                    cls="hidden",
+                    aria_hidden="true"
+                ),
+
+                Div(
+                    Button(
+                        self.get_text("submit"),
+                        type="submit",
+                        cls="w-full bg-[#3D2E7C] hover:bg-[#3D2E7C]/90 text-white font-medium py-2 px-4 rounded-lg focus-visible:outline-none focus-visible:ring-2 focus-visible:ring-[#3D2E7C] focus-visible:ring-offset-2 disabled:opacity-60"
+                    ),
+
+                    # Filled in by contact-form.js after submitting
+                    P(
+                        role="status",
+                        aria_live="polite",
+                        data_sent=self.get_text("sent"),
+                        data_invalid=self.get_text("invalid"),
+                        data_error=self.get_text("error"),
+                        cls="contact-status text-center text-sm text-gray-600 mt-3 min-h-[1.25rem]"
+                    ),
+                    cls="flex flex-col"
+                ),
+
+                cls="flex flex-col gap-6"
+            ),
+            method="post",
+            action=self.action,
+            cls="contact-form flex flex-col gap-6",
+            aria_labelledby="demo-request-heading"
+        )
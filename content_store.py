@@ -0,0 +1,254 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import unicodedata
+
+from icons import IconSprite
+from image_index import build_image_index
+
+try:
+    # watchfiles uses inotify on Linux; polling is used when it is missing
+    import watchfiles
+except ImportError:
+    watchfiles = None
+
+
+def slugify(text):
+    """URL slug of a title, e.g. "Sport & Squashclub do-it" -> "sport-squashclub-do-it"."""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+class ContentSnapshot:
+    """Everything a rendered page depends on, loaded at one point in time.
+
+    Snapshots are never modified after they are published, apart from the
+    render caches that belong to them.
+    """
+
+    def __init__(self, translations, data, file_versions, icons, images, version):
+        """Initialize the snapshot with already parsed content."""
+        self.translations = translations
+        self.data = data
+        self.file_versions = file_versions
+        self.icons = icons
+        self.images = images
+        self.version = version
+        self.cases = self._index_cases(self.success_stories)
+
+        # Render caches, filled lazily or by the background re-render
+        self.pages = {}
+        self.review_fragments = {}
+
+    @property
+    def reviews(self):
+        """Reviews from public/data/reviews.json."""
+        return self.data.get("reviews", [])
+
+    @property
+    def success_stories(self):
+        """Success stories from public/data/success_stories.json."""
+        return self.data.get("success_stories", [])
+
+    @staticmethod
+    def _index_cases(stories):
+        """Map the URL slug of every success story to the story, in file order.
+
+        A story can set its own "slug"; otherwise it is made from the title.
+        """
+        cases = {}
+        for story in stories:
+            title = story.get("title", {})
+            base = story.get("slug") or slugify(title.get("en") or title.get("nl") or "") or "case"
+            slug, n = base, 2
+            while slug in cases:
+                slug, n = f"{base}-{n}", n + 1
+            cases[slug] = story
+        return cases
+
+
+class ContentStore:
+    """Loads site content from disk and keeps it fresh in the background.
+
+    The current snapshot is swapped atomically once a new one has been
+    loaded (and pre-rendered by the `on_reload` callbacks), so requests never
+    wait on disk and keep seeing the old content until then. The
+    `after_reload` callbacks run once the new snapshot is live.
+    """
+
+    languages = ["nl", "en"]
+
+    def __init__(self, base_dir, poll_interval=2.0):
+        """Initialize the store and load the first snapshot synchronously."""
+        self.base_dir = base_dir
+        self.poll_interval = poll_interval
+        self.translations_dir = os.path.join(base_dir, "translations")
+        self.public_dir = os.path.join(base_dir, "public")
+        self.data_files = {
+            "reviews": os.path.join(self.public_dir, "data", "reviews.json"),
+            "success_stories": os.path.join(self.public_dir, "data", "success_stories.json"),
+        }
+        self.on_reload = []
+        self.after_reload = []
+        self._image_sizes = {}
+        self._task = None
+        self._stop_event = None
+        self.snapshot = self.load()
+
+    def _load_json(self, file_path, default):
+        """Read a JSON file, falling back to `default` when it is unusable."""
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            print(f"Error loading {file_path}: {e}")
+            return default
+
+    def load(self):
+        """Read translations, data files and asset versions into a snapshot.
+
+        A file that cannot be parsed (e.g. while it is being saved) keeps the
+        value from the current snapshot instead of being emptied.
+        """
+        previous = getattr(self, "snapshot", None)
+        digest = hashlib.sha1()
+
+        translations = {}
+        for lang in self.languages:
+            file_path = os.path.join(self.translations_dir, f"{lang}.json")
+            default = previous.translations.get(lang, {}) if previous else {}
+            translations[lang] = self._load_json(file_path, default)
+            digest.update(json.dumps(translations[lang], sort_keys=True).encode())
+
+        data = {}
+        for name, file_path in sorted(self.data_files.items()):
+            default = previous.data.get(name, []) if previous else []
+            data[name] = self._load_json(file_path, default)
+            digest.update(json.dumps(data[name], sort_keys=True).encode())
+
+        # Assets only affect the page through their versioned URLs
+        file_versions = {}
+        for root, dirs, files in os.walk(self.public_dir):
+            dirs.sort()
+            for name in sorted(files):
+                full_path = os.path.join(root, name)
+                rel_path = os.path.relpath(full_path, self.base_dir).replace(os.sep, "/")
+                try:
+                    stat = os.stat(full_path)
+                except OSError:
+                    continue
+                file_versions[rel_path] = str(int(stat.st_mtime))
+                digest.update(f"{rel_path}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+
+        assets_dir = os.path.join(self.public_dir, "assets")
+        icons = IconSprite.from_directory(assets_dir)
+        images = build_image_index(assets_dir, self.base_dir, self._image_sizes)
+
+        # Placeholders generated by scripts/image_placeholders.py
+        manifest = self._load_json(os.path.join(assets_dir, "manifest.json"), {})
+        for file_name, entry in manifest.items():
+            path = f"public/assets/{file_name}"
+            if path in images:
+                images[path] = {**images[path], **entry}
+
+        return ContentSnapshot(translations, data, file_versions, icons, images, digest.hexdigest()[:16])
+
+    def reload(self):
+        """Synchronously load and publish a new snapshot."""
+        self.snapshot = self.load()
+        return self.snapshot
+
+    async def refresh(self):
+        """Load a new snapshot off the event loop, prepare it and swap it in.
+
+        Returns False if the content couldn't be loaded.
+        """
+        try:
+            snapshot = await asyncio.to_thread(self.load)
+        except Exception as e:
+            # E.g. a file removed while it was being read; the current
+            # snapshot stays until a later refresh succeeds
+            print(f"Error loading content snapshot: {e}")
+            return False
+        if snapshot.version == self.snapshot.version:
+            return True
+
+        for callback in self.on_reload:
+            try:
+                await callback(snapshot)
+            except Exception as e:
+                print(f"Error preparing content snapshot: {e}")
+
+        self.snapshot = snapshot
+
+        for callback in self.after_reload:
+            try:
+                await callback(snapshot)
+            except Exception as e:
+                print(f"Error after publishing content snapshot: {e}")
+        return True
+
+    def watched_paths(self):
+        """Directories whose changes trigger a refresh."""
+        return [path for path in (self.translations_dir, self.public_dir) if os.path.isdir(path)]
+
+    def _signature(self):
+        """Cheap fingerprint of the watched files for the polling watcher."""
+        signature = {}
+        for path in self.watched_paths():
+            for root, _, files in os.walk(path):
+                for name in files:
+                    full_path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(full_path)
+                    except OSError:
+                        continue
+                    signature[full_path] = (stat.st_mtime_ns, stat.st_size)
+        return signature
+
+    async def _watch_inotify(self):
+        """Refresh whenever inotify reports a change under the watched paths."""
+        async for _ in watchfiles.awatch(*self.watched_paths(), stop_event=self._stop_event):
+            await self.refresh()
+
+    async def _watch_polling(self):
+        """Refresh whenever the polled file signature changes."""
+        signature = await asyncio.to_thread(self._signature)
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            current = await asyncio.to_thread(self._signature)
+            if current != signature:
+                # Try again on the next poll if loading failed
+                signature = current if await self.refresh() else None
+
+    async def watch(self):
+        """Watch the content paths until cancelled."""
+        if watchfiles is not None:
+            try:
+                await self._watch_inotify()
+                return
+            except (OSError, RuntimeError) as e:
+                print(f"File watcher unavailable, falling back to polling: {e}")
+        await self._watch_polling()
+
+    async def start(self):
+        """Start the background watcher task."""
+        if self._task is None:
+            self._stop_event = asyncio.Event()
+            self._task = asyncio.create_task(self.watch())
+
+    async def stop(self):
+        """Cancel the background watcher task."""
+        if self._task is not None:
+            # Let watchfiles shut its watcher thread down cleanly first
+            self._stop_event.set()
+            done, _ = await asyncio.wait({self._task}, timeout=1.0)
+            if not done:
+                self._task.cancel()
+                try:
+                    await self._task
+                except asyncio.CancelledError:
+                    pass
+            self._task = None
@@ -0,0 +1,229 @@
+import re
+from html import escape
+from html.parser import HTMLParser
+
+# Elements whose surrounding whitespace never renders
+BLOCK_TAGS = {
+    "address", "article", "aside", "base", "blockquote", "body", "dd", "details", "dialog", "div",
+    "dl", "dt", "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4",
+    "h5", "h6", "head", "header", "hr", "html", "li", "link", "main", "meta", "nav", "noscript",
+    "ol", "option", "p", "script", "section", "style", "table", "tbody", "td", "template",
+    "tfoot", "th", "thead", "title", "tr", "ul",
+}
+
+# Elements whose content is kept verbatim
+RAW_TAGS = {"script", "style", "pre", "textarea"}
+
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source",
+    "track", "wbr",
+}
+
+BOOLEAN_ATTRS = {
+    "allowfullscreen", "async", "autofocus", "autoplay", "checked", "controls", "default",
+    "defer", "disabled", "formnovalidate", "hidden", "inert", "ismap", "itemscope", "loop",
+    "multiple", "muted", "nomodule", "novalidate", "open", "playsinline", "readonly",
+    "required", "reversed", "selected",
+}
+
+# Start tags that implicitly close an open <p>
+P_CLOSERS = {
+    "address", "article", "aside", "blockquote", "details", "div", "dl", "fieldset",
+    "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header",
+    "hr", "main", "menu", "nav", "ol", "p", "pre", "section", "table", "ul",
+}
+
+# End tags that may be omitted, with the start tags that allow omitting them.
+# An end tag is also omitted when its parent closes right after it.
+# All of them are block-level, so whitespace after them is dropped anyway.
+OPTIONAL_END_TAGS = {
+    "li": {"li"},
+    "p": P_CLOSERS,
+    "dt": {"dt", "dd"},
+    "dd": {"dt", "dd"},
+    "option": {"option", "optgroup"},
+    "tr": {"tr"},
+    "td": {"td", "th"},
+    "th": {"td", "th"},
+}
+
+# Elements whose content is parsed as XML-like foreign content
+FOREIGN_TAGS = {"svg", "math"}
+
+# Parents in which a trailing </p> must stay
+P_KEEP_END_PARENTS = {"a", "audio", "del", "ins", "map", "noscript", "video"}
+
+UNQUOTED_VALUE = re.compile(r"^[^\s\"'=<>`]+$")
+WHITESPACE = re.compile(r"\s+")
+
+
+class HTMLMinifier(HTMLParser):
+    """Incremental HTML minifier.
+
+    Feed it rendered HTML (in one piece or in chunks) and collect the output
+    of each `feed` call. Collapses whitespace, drops optional attribute
+    quotes and end tags, and shortens boolean attributes. Content of script,
+    style, pre and textarea elements is passed through untouched.
+    """
+
+    def __init__(self):
+        """Initialize the minifier state."""
+        super().__init__(convert_charrefs=False)
+        self._out = []
+        self._stack = []
+        self._raw_depth = 0
+        self._foreign_depth = 0
+        # Output that depends on the next token
+        self._pending_end = None
+        self._pending_space = False
+        self._last_block = True
+
+    def feed(self, data):
+        """Minify the next piece of HTML and return the output produced so far."""
+        super().feed(data)
+        return self._take()
+
+    def close(self):
+        """Flush everything that is still pending and return it."""
+        super().close()
+        self._flush_pending(None)
+        return self._take()
+
+    def _take(self):
+        """Return and clear the output collected so far."""
+        output = "".join(self._out)
+        self._out = []
+        return output
+
+    def _flush_pending(self, next_token, next_is_end=False):
+        """Decide on the pending end tag and whitespace now the next token is known.
+
+        `next_token` is the next tag name, "#text" for text, or None at the end
+        of the input. Pending end tags are kept at the end of the input, since
+        the input may be a fragment of a larger document.
+        """
+        next_block = next_token is None or next_token in BLOCK_TAGS
+        if self._pending_end is not None:
+            tag, parent = self._pending_end
+            if next_is_end:
+                # The parent closes right after this element
+                omit = not (tag == "p" and parent in P_KEEP_END_PARENTS)
+            else:
+                omit = next_token in OPTIONAL_END_TAGS[tag]
+            if not omit:
+                self._out.append(f"</{tag}>")
+            self._pending_end = None
+        if self._pending_space and not next_block and not self._last_block:
+            self._out.append(" ")
+        self._pending_space = False
+
+    def _attrs(self, attrs):
+        """Serialize attributes with the shortest safe syntax."""
+        parts = []
+        for name, value in attrs:
+            if value is None or name in BOOLEAN_ATTRS:
+                parts.append(name)
+            elif value and UNQUOTED_VALUE.match(value) and not value.endswith("/"):
+                parts.append(f"{name}={escape(value, quote=False)}")
+            else:
+                parts.append(f'{name}="{escape(value)}"')
+        return "".join(" " + part for part in parts)
+
+    def handle_decl(self, decl):
+        self._flush_pending("html")
+        self._out.append(f"<!{decl}>")
+        self._last_block = True
+
+    def handle_starttag(self, tag, attrs):
+        if self._raw_depth:
+            self._out.append(self.get_starttag_text())
+            return
+        self._flush_pending(tag)
+        self._out.append(f"<{tag}{self._attrs(attrs)}>")
+        self._last_block = tag in BLOCK_TAGS
+        if tag not in VOID_TAGS:
+            self._stack.append(tag)
+            if tag in RAW_TAGS:
+                self._raw_depth += 1
+            if tag in FOREIGN_TAGS:
+                self._foreign_depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        if self._raw_depth:
+            self._out.append(self.get_starttag_text())
+            return
+        self._flush_pending(tag)
+        attrs = self._attrs(attrs)
+        if self._foreign_depth and tag not in VOID_TAGS:
+            # Self-closing syntax only counts in SVG and MathML, where it
+            # must be kept; a slash right after an unquoted value would
+            # become part of the value
+            slash = " />" if attrs and not attrs.endswith('"') else "/>"
+            self._out.append(f"<{tag}{attrs}{slash}")
+        else:
+            self._out.append(f"<{tag}{attrs}>")
+        self._last_block = tag in BLOCK_TAGS
+
+    def handle_endtag(self, tag):
+        if self._raw_depth and tag not in RAW_TAGS:
+            self._out.append(f"</{tag}>")
+            return
+        if tag in VOID_TAGS:
+            return
+        self._flush_pending(tag, next_is_end=True)
+        if tag in self._stack:
+            while self._stack and self._stack.pop() != tag:
+                pass
+        if tag in RAW_TAGS:
+            self._raw_depth = max(0, self._raw_depth - 1)
+        if tag in FOREIGN_TAGS:
+            self._foreign_depth = max(0, self._foreign_depth - 1)
+        if tag in OPTIONAL_END_TAGS and not self._raw_depth:
+            # Decide once the next token shows whether this end tag is implied
+            self._pending_end = (tag, self._stack[-1] if self._stack else None)
+        else:
+            self._out.append(f"</{tag}>")
+        self._last_block = tag in BLOCK_TAGS
+
+    def handle_data(self, data):
+        if self._raw_depth:
+            self._out.append(data)
+            return
+        if not data.strip():
+            self._pending_space = self._pending_space or bool(data)
+            return
+        leading = data[0].isspace()
+        trailing = data[-1].isspace()
+        text = WHITESPACE.sub(" ", data.strip())
+        if leading:
+            self._pending_space = True
+        self._flush_pending("#text")
+        self._out.append(text)
+        self._last_block = False
+        self._pending_space = trailing
+
+    def handle_entityref(self, name):
+        self._handle_ref(f"&{name};")
+
+    def handle_charref(self, name):
+        self._handle_ref(f"&#{name};")
+
+    def _handle_ref(self, ref):
+        """Emit an entity or character reference as text."""
+        if self._raw_depth:
+            self._out.append(ref)
+            return
+        self._flush_pending("#text")
+        self._out.append(ref)
+        self._last_block = False
+
+    def handle_comment(self, data):
+        # Comments are dropped, except inside raw elements
+        if self._raw_depth:
+            self._out.append(f"<!--{data}-->")
+
+
+def minify_html(html):
+    """Minify a complete HTML document or fragment."""
+    minifier = HTMLMinifier()
+    return minifier.feed(html) + minifier.close()
@@ -0,0 +1,116 @@
+import os
+import re
+import xml.etree.ElementTree as ET
+
+SVG_NS = "{http://www.w3.org/2000/svg}"
+XLINK_HREF = "{http://www.w3.org/1999/xlink}href"
+
+# Root attributes that describe the canvas rather than how the icon is drawn
+CANVAS_ATTRS = {"width", "height", "viewBox", "version", "x", "y", "xmlns"}
+
+# Elements that never render
+DROP_TAGS = {"title", "desc", "metadata"}
+
+ID_REF = re.compile(r"url\(#([^)]+)\)")
+
+
+class IconSprite:
+    """Inline SVG sprite built from the small SVG files in a directory.
+
+    Each icon becomes a `<symbol id="icon-<name>">`, where `<name>` is the
+    file name without extension, so pages can draw it with
+    `<svg><use href="#icon-<name>"></use></svg>` instead of requesting the file.
+    """
+
+    def __init__(self, symbols):
+        """Initialize the sprite from a mapping of icon name to symbol markup."""
+        self.symbols = symbols
+
+    @classmethod
+    def from_directory(cls, directory, max_bytes=4096):
+        """Build a sprite from every SVG in `directory` up to `max_bytes` in size."""
+        symbols = {}
+        if not os.path.isdir(directory):
+            return cls(symbols)
+
+        for file_name in sorted(os.listdir(directory)):
+            name, ext = os.path.splitext(file_name)
+            file_path = os.path.join(directory, file_name)
+            if ext.lower() != ".svg" or os.path.getsize(file_path) > max_bytes:
+                continue
+            try:
+                symbols[name] = cls._symbol(name, ET.parse(file_path).getroot())
+            except ET.ParseError as e:
+                print(f"Error loading icon {file_name}: {e}")
+        return cls(symbols)
+
+    @staticmethod
+    def _symbol(name, root):
+        """Convert a parsed SVG document into symbol markup."""
+        prefix = f"icon-{name}-"
+
+        view_box = root.get("viewBox")
+        if view_box is None:
+            width = root.get("width", "24").removesuffix("px")
+            height = root.get("height", "24").removesuffix("px")
+            view_box = f"0 0 {width} {height}"
+
+        # Presentation attributes of the root apply to everything inside it
+        group = ET.Element("g", {k: v for k, v in root.attrib.items() if k not in CANVAS_ATTRS and "}" not in k})
+        group.extend(list(root))
+
+        # Only ids that something points at need to be kept
+        referenced = set()
+        for element in root.iter():
+            for key, value in element.attrib.items():
+                referenced.update(ID_REF.findall(value))
+                if key in ("href", XLINK_HREF) and value.startswith("#"):
+                    referenced.add(value[1:])
+
+        def clean(element):
+            for child in list(element):
+                tag = child.tag.replace(SVG_NS, "")
+                if tag in DROP_TAGS or (tag == "g" and len(child) == 0 and not (child.text or "").strip()):
+                    element.remove(child)
+                else:
+                    clean(child)
+
+            element.tag = element.tag.replace(SVG_NS, "")
+            # Keep ids unique within the page and point references at the renamed ids
+            if "id" in element.attrib:
+                if element.get("id") in referenced:
+                    element.set("id", prefix + element.get("id"))
+                else:
+                    del element.attrib["id"]
+            if XLINK_HREF in element.attrib:
+                element.set("href", element.attrib.pop(XLINK_HREF))
+            for key, value in element.attrib.items():
+                if key == "href" and value.startswith("#"):
+                    element.set(key, "#" + prefix + value[1:])
+                elif "url(#" in value:
+                    element.set(key, ID_REF.sub(lambda m: f"url(#{prefix}{m.group(1)})", value))
+            if element.text and not element.text.strip():
+                element.text = None
+            if element.tail and not element.tail.strip():
+                element.tail = None
+
+        clean(group)
+        # Drop the group again if it adds nothing
+        if not group.attrib:
+            body = "".join(ET.tostring(child, encoding="unicode") for child in group)
+        else:
+            body = ET.tostring(group, encoding="unicode")
+        return f'<symbol id="icon-{name}" viewBox="{view_box}">{body}</symbol>'
+
+    def __contains__(self, name):
+        return name in self.symbols
+
+    def markup(self):
+        """Return the hidden SVG element holding all symbols."""
+        # Not display:none, which would break clip paths and gradients in symbols
+        return (
+            '<svg xmlns="http://www.w3.org/2000/svg" aria-hidden="true" '
+            'style="position:absolute;width:0;height:0;overflow:hidden">'
+            + "".join(self.symbols.values())
+            + "</svg>"
+        )
@@ -0,0 +1,112 @@
+import os
+import re
+import struct
+import xml.etree.ElementTree as ET
+
+# JPEG start-of-frame markers, which carry the image size
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+SVG_LENGTH = re.compile(r"^\s*([\d.]+)\s*(px)?\s*$")
+
+
+def _png_size(f):
+    header = f.read(24)
+    if header[:8] != b"\x89PNG\r\n\x1a\n" or header[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", header[16:24])
+
+
+def _gif_size(f):
+    header = f.read(10)
+    if header[:6] not in (b"GIF87a", b"GIF89a"):
+        return None
+    return struct.unpack("<HH", header[6:10])
+
+
+def _jpeg_size(f):
+    if f.read(2) != b"\xff\xd8":
+        return None
+    while True:
+        byte = f.read(1)
+        while byte and byte != b"\xff":
+            byte = f.read(1)
+        while byte == b"\xff":
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            # Markers without a segment
+            continue
+        length = struct.unpack(">H", f.read(2))[0]
+        if marker in JPEG_SOF_MARKERS:
+            height, width = struct.unpack(">xHH", f.read(5))
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def _svg_size(f):
+    root = ET.parse(f).getroot()
+    width = SVG_LENGTH.match(root.get("width", ""))
+    height = SVG_LENGTH.match(root.get("height", ""))
+    if width and height:
+        return round(float(width.group(1))), round(float(height.group(1)))
+    view_box = (root.get("viewBox") or "").replace(",", " ").split()
+    if len(view_box) == 4:
+        return round(float(view_box[2])), round(float(view_box[3]))
+    return None
+
+
+READERS = {
+    ".png": _png_size,
+    ".gif": _gif_size,
+    ".jpg": _jpeg_size,
+    ".jpeg": _jpeg_size,
+    ".svg": _svg_size,
+}
+
+
+def image_size(file_path):
+    """Return the intrinsic (width, height) of an image, or None if unknown.
+
+    Only the file header is read (the whole document for SVG).
+    """
+    reader = READERS.get(os.path.splitext(file_path)[1].lower())
+    if reader is None:
+        return None
+    try:
+        with open(file_path, "rb") as f:
+            return reader(f)
+    except (OSError, struct.error, ET.ParseError, ValueError) as e:
+        print(f"Error reading image size of {file_path}: {e}")
+        return None
+
+
+def build_image_index(directory, base_dir, cache=None):
+    """Map the path of every image under `directory` to its size.
+
+    Paths are relative to `base_dir` with forward slashes, matching the
+    content snapshot's file versions. Sizes in `cache` are reused for files
+    that haven't changed since they were read.
+    """
+    cache = {} if cache is None else cache
+    index = {}
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            full_path = os.path.join(root, name)
+            try:
+                stat = os.stat(full_path)
+            except OSError:
+                continue
+            signature = (stat.st_mtime_ns, stat.st_size)
+            cached = cache.get(full_path)
+            if cached is not None and cached[0] == signature:
+                size = cached[1]
+            else:
+                size = image_size(full_path)
+                cache[full_path] = (signature, size)
+            if size is not None:
+                rel_path = os.path.relpath(full_path, base_dir).replace(os.sep, "/")
+                index[rel_path] = {"width": size[0], "height": size[1]}
+    return index
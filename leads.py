@@ -0,0 +1,256 @@
+import asyncio
+import json
+import re
+import sqlite3
+import time
+import urllib.request
+
+# Maximum length of each contact form field
+LEAD_FIELDS = {
+    "name": 100,
+    "email": 254,
+    "club": 100,
+    "phone": 40,
+    "message": 2000,
+}
+REQUIRED_FIELDS = ("name", "email", "club")
+
+# Hidden field that only bots fill in
+HONEYPOT_FIELD = "website"
+
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def validate_lead(form):
+    """Clean up a submitted contact form.
+
+    Returns the lead and a dict of field name to error ("required",
+    "invalid" or "too_long"). The lead is None when the honeypot field was
+    filled in, i.e. the submission should be accepted but ignored.
+    """
+    lead = {name: " ".join(str(form.get(name, "")).split()) for name in LEAD_FIELDS}
+    # Keep the line breaks of the message
+    lead["message"] = str(form.get("message", "")).strip()
+
+    errors = {}
+    for name, max_length in LEAD_FIELDS.items():
+        if not lead[name] and name in REQUIRED_FIELDS:
+            errors[name] = "required"
+        elif len(lead[name]) > max_length:
+            errors[name] = "too_long"
+    if "email" not in errors and not EMAIL_PATTERN.match(lead["email"]):
+        errors["email"] = "invalid"
+
+    if str(form.get(HONEYPOT_FIELD, "")).strip():
+        return None, {}
+    return lead, errors
+
+
+class LogNotifier:
+    """Sends notifications to the log only; the default without a webhook.
+
+    Only the lead ids are logged; names and contact details stay in the
+    leads database.
+    """
+
+    def send(self, leads):
+        ids = ", ".join(str(lead["id"]) for lead in leads)
+        print(f"{len(leads)} new contact request(s): lead {ids}")
+
+
+class MemoryNotifier:
+    """Keeps sent leads in memory, for scripts and local checks.
+
+    `delay` seconds are spent on every batch, like a slow mail server.
+    """
+
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.sent = []
+
+    def send(self, leads):
+        if self.delay:
+            time.sleep(self.delay)
+        self.sent.extend(leads)
+
+
+class WebhookNotifier:
+    """Posts every batch of leads as JSON (`{"leads": [...]}`) to a webhook."""
+
+    def __init__(self, url, timeout=10):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, leads):
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps({"leads": leads}).encode(),
+            headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class LeadQueue:
+    """Write-behind queue for contact requests.
+
+    Submitting a lead only puts it on a bounded queue, so the form is
+    answered right away however slow the database or the notifier are. A
+    background task inserts the queued leads into SQLite in batches and then
+    hands them to the notifier. Leads whose notification failed stay marked
+    as unsent in the database and are retried, also after a restart.
+    """
+
+    def __init__(self, db_path, notifier, max_queue=1000, batch_size=100, retry_interval=60, store_attempts=3):
+        """Open (and if needed create) the database."""
+        self.db_path = db_path
+        self.notifier = notifier
+        self.batch_size = batch_size
+        self.retry_interval = retry_interval
+        self.store_attempts = store_attempts
+        self._queue = asyncio.Queue(maxsize=max_queue)
+        self._task = None
+        self._processing = None
+        # Whether the database may hold leads that still need to be sent
+        self._unsent = True
+        self.accepted = 0
+        self.rejected = 0
+        self.stored = 0
+        self.notified = 0
+        self.failed = 0
+        self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS leads ("
+            "id INTEGER PRIMARY KEY, created REAL NOT NULL, lang TEXT NOT NULL, "
+            "name TEXT NOT NULL, email TEXT NOT NULL, club TEXT NOT NULL, phone TEXT NOT NULL, "
+            "message TEXT NOT NULL, notified INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS leads_unsent ON leads (id) WHERE notified = 0")
+
+    def submit(self, lead):
+        """Queue a lead; False means the queue is full and it was not accepted."""
+        try:
+            self._queue.put_nowait(lead)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return False
+        self.accepted += 1
+        return True
+
+    def _take_batch(self):
+        batch = []
+        while len(batch) < self.batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    def _insert(self, batch):
+        """Insert a batch of leads in one transaction (blocking)."""
+        rows = [
+            (lead["created"], lead["lang"], lead["name"], lead["email"], lead["club"], lead["phone"], lead["message"])
+            for lead in batch
+        ]
+        with self._db:
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "INSERT INTO leads (created, lang, name, email, club, phone, message) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def _unsent_leads(self):
+        rows = self._db.execute(
+            "SELECT id, created, lang, name, email, club, phone, message FROM leads "
+            "WHERE notified = 0 ORDER BY id LIMIT ?",
+            (self.batch_size,)
+        ).fetchall()
+        columns = ("id", "created", "lang", "name", "email", "club", "phone", "message")
+        return [dict(zip(columns, row)) for row in rows]
+
+    def _mark_notified(self, leads):
+        with self._db:
+            self._db.execute("BEGIN")
+            self._db.executemany("UPDATE leads SET notified = 1 WHERE id = ?", [(lead["id"],) for lead in leads])
+
+    async def _store(self, batch):
+        """Insert a batch, retrying a few times before giving up on it."""
+        for attempt in range(self.store_attempts):
+            try:
+                await asyncio.to_thread(self._insert, batch)
+            except sqlite3.Error as e:
+                print(f"Error storing contact requests (attempt {attempt + 1}): {e}")
+                await asyncio.sleep(attempt + 1)
+            else:
+                self.stored += len(batch)
+                self._unsent = True
+                return
+        # Don't lose them entirely; the log still has them
+        for lead in batch:
+            print(f"Contact request not stored: {json.dumps(lead)}")
+
+    async def _notify(self):
+        """Send the stored leads that haven't been sent yet."""
+        while self._unsent:
+            try:
+                leads = await asyncio.to_thread(self._unsent_leads)
+                if not leads:
+                    self._unsent = False
+                    return
+                await asyncio.to_thread(self.notifier.send, leads)
+                await asyncio.to_thread(self._mark_notified, leads)
+            except Exception as e:
+                # Retried with the next batch, or after `retry_interval`
+                print(f"Error sending contact requests: {e}")
+                self.failed += 1
+                return
+            self.notified += len(leads)
+
+    async def run(self):
+        """Store and send queued leads until cancelled."""
+        while True:
+            try:
+                timeout = self.retry_interval if self._unsent else None
+                batch = [await asyncio.wait_for(self._queue.get(), timeout)]
+            except asyncio.TimeoutError:
+                batch = []
+            batch.extend(self._take_batch())
+            # Shielded, so stopping waits for a batch that is half written
+            self._processing = asyncio.ensure_future(self._process(batch))
+            await asyncio.shield(self._processing)
+
+    async def _process(self, batch):
+        if batch:
+            await self._store(batch)
+        await self._notify()
+
+    async def start(self):
+        """Start the background writer."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """Stop the background writer, store what is still queued and close the database."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._processing is not None:
+            await self._processing
+
+        while batch := self._take_batch():
+            await self._store(batch)
+        self._db.close()
+
+    def stats(self):
+        """Return the queue counters."""
+        return {
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "queued": self._queue.qsize(),
+            "stored": self.stored,
+            "notified": self.notified,
+            "notify_failures": self.failed,
+        }
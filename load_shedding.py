@@ -0,0 +1,189 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict
+
+from starlette.responses import PlainTextResponse
+
+
+class TokenBuckets:
+    """In-memory token buckets, one per key.
+
+    Each bucket holds up to `burst` tokens and refills at `rate` tokens per
+    second. Only the `max_keys` most recently used buckets are kept; a
+    forgotten bucket simply starts full again.
+    """
+
+    def __init__(self, rate, burst, max_keys=10000):
+        """Initialize an empty set of buckets."""
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+
+    def take(self, key, now=None):
+        """Take a token for `key`.
+
+        Returns 0 when a token was available, otherwise the number of
+        seconds until the next one is.
+        """
+        now = time.monotonic() if now is None else now
+        tokens, updated = self._buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+
+        wait = 0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+class LoadShedder:
+    """Admission control shared by the middleware and the metrics endpoint.
+
+    At most `max_concurrent` requests are handled at once. Up to `max_queue`
+    more wait for a slot, for at most `max_wait` seconds; anything beyond
+    that is shed. Each client also has a token bucket per route class.
+    Route classes in `unslotted` don't take a slot: they spend their time
+    waiting on a pool of their own, which bounds them instead.
+    """
+
+    # Logins mostly wait for the password hashing pool
+    unslotted = {"login"}
+
+    # (tokens per second, burst) per route class
+    rate_limits = {
+        "login": (5 / 60, 5),
+        "contact": (3 / 60, 5),
+        "page": (10, 40),
+        "static": (50, 200),
+    }
+
+    def __init__(self, max_concurrent=32, max_queue=64, max_wait=1.0):
+        """Initialize the limits and counters."""
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.buckets = {name: TokenBuckets(rate, burst) for name, (rate, burst) in self.rate_limits.items()}
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self.in_flight = 0
+        self.queued = 0
+        self.shed = 0
+        self.limited = {name: 0 for name in self.rate_limits}
+
+    @staticmethod
+    def route_class(method, path):
+        """Name of the rate limit that applies to a request."""
+        if path == "/en" or path.startswith("/en/"):
+            path = path.removeprefix("/en") or "/"
+        if path.startswith("/static/"):
+            return "static"
+        if method == "POST" and path in ("/login", "/logout"):
+            return "login"
+        if method == "POST" and path == "/contact":
+            return "contact"
+        return "page"
+
+    def check_rate(self, client, route_class):
+        """Return 0 if the client may make a request of a route class, else seconds to wait."""
+        wait = self.buckets[route_class].take(client)
+        if wait:
+            self.limited[route_class] += 1
+        return wait
+
+    async def acquire(self):
+        """Wait for a request slot; False means the request must be shed."""
+        if not self._slots.locked():
+            await self._slots.acquire()
+            self.in_flight += 1
+            return True
+        if self.queued >= self.max_queue:
+            self.shed += 1
+            return False
+
+        self.queued += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.max_wait)
+        except asyncio.TimeoutError:
+            self.shed += 1
+            return False
+        finally:
+            self.queued -= 1
+        self.in_flight += 1
+        return True
+
+    def release(self):
+        """Free a request slot."""
+        self.in_flight -= 1
+        self._slots.release()
+
+    def stats(self):
+        """Return the admission counters."""
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "shed": self.shed,
+            "rate_limited": dict(self.limited),
+        }
+
+
+class LoadSheddingMiddleware:
+    """Rejects requests early when the server or a client is over its limit.
+
+    A plain ASGI middleware rather than a BaseHTTPMiddleware, so a request
+    keeps its slot until its (possibly streamed) body has been sent.
+    """
+
+    def __init__(self, app, shedder, is_exempt=None):
+        """Initialize the middleware."""
+        self.app = app
+        self.shedder = shedder
+        self.is_exempt = is_exempt or (lambda path: False)
+
+    @staticmethod
+    def client_ip(scope):
+        """Address of the client.
+
+        Behind a proxy, uvicorn puts the address from X-Forwarded-For here
+        when the proxy is in its --forwarded-allow-ips (FORWARDED_ALLOW_IPS).
+        """
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.is_exempt(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        route_class = self.shedder.route_class(scope["method"], scope["path"])
+        wait = self.shedder.check_rate(self.client_ip(scope), route_class)
+        if wait:
+            response = PlainTextResponse(
+                "Too many requests",
+                status_code=429,
+                headers={"Retry-After": str(math.ceil(wait))}
+            )
+            await response(scope, receive, send)
+            return
+
+        if route_class in self.shedder.unslotted:
+            await self.app(scope, receive, send)
+            return
+        if not await self.shedder.acquire():
+            response = PlainTextResponse(
+                "Server busy, please try again shortly",
+                status_code=503,
+                headers={"Retry-After": "1"}
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.shedder.release()
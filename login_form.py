@@ -47,7 +47,7 @@ class LoginForm:
                     
                     Div(
                         "Don't have an account? ",
-                        A("Contact us", href="mailto:info@teambee.nl", aria_label="Contact us to create a new account",
+                        A("Contact us", href="#demo-request", data_scroll_to="demo-request", aria_label="Contact us to create a new account",
                           cls="text-[#3D2E7C] hover:underline focus-visible:outline-none focus-visible:ring-2 focus-visible:ring-[#3D2E7C] focus-visible:ring-offset-2 rounded"),
                         cls="text-center text-sm text-gray-500 mt-3"
                     ),
@@ -57,7 +57,7 @@ class LoginForm:
                 cls="flex flex-col gap-6"
             ),
             method="post",
-            action="#",
+            action="/login",
             cls="flex flex-col gap-6",
             aria_labelledby="login-heading",
             role="form" 
@@ -1,13 +1,29 @@
 from fasthtml.common import *
+from fasthtml.svg import Use
 from login_form import LoginForm
+from contact_form import ContactForm
+from content_store import ContentStore, slugify
+from single_flight import SingleFlight
+from html_minify import HTMLMinifier, minify_html
+from vendor import VENDOR_SCRIPTS, VendorScripts, ImmutableStaticFiles
+from static_files import CachedStaticFiles
+from auth import PasswordHasher, AuthStore
+from load_shedding import LoadShedder, LoadSheddingMiddleware
+from access_log import AccessLog, AccessLogMiddleware
+from leads import LeadQueue, LogNotifier, WebhookNotifier, validate_lead
+from cdn import CDNPurger, page_keys, static_file_keys, surrogate_headers
+from search_index import SearchIndex
 from datetime import datetime
 import os
 import time
 import json
-from starlette.staticfiles import StaticFiles
+import hashlib
+import asyncio
+from contextvars import ContextVar
+from starlette.requests import Request
 from starlette.middleware import Middleware
 from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import RedirectResponse, PlainTextResponse
+from starlette.responses import RedirectResponse, PlainTextResponse, HTMLResponse, JSONResponse, Response, StreamingResponse
 
 class CustomHTTPSRedirectMiddleware(BaseHTTPMiddleware):
     """Custom HTTPS redirect middleware that excludes health check endpoints."""
@@ -36,13 +52,19 @@ class CustomHTTPSRedirectMiddleware(BaseHTTPMiddleware):
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     """Middleware to add security headers to all responses."""
     
+    def __init__(self, app, script_origins=None):
+        super().__init__(app)
+        # External origins scripts may still be loaded from
+        self.script_src = " ".join(["'self'", *(script_origins or [])])
+    
     async def dispatch(self, request, call_next):
         response = await call_next(request)
         
         # Content Security Policy
         response.headers["Content-Security-Policy"] = (
             "default-src 'self'; "
-            "script-src 'self' https://unpkg.com https://cdn.jsdelivr.net; "
+            # Speculation rules are inserted by language-dropdown.js
+            f"script-src {self.script_src} 'inline-speculation-rules'; "
             "style-src 'self' 'unsafe-inline'; "
             "img-src 'self' data:; "
             "font-src 'self'; "
@@ -86,18 +108,86 @@ class LanguageMiddleware(BaseHTTPMiddleware):
         response = await call_next(request)
         return response
 
+# Request being rendered, kept per task/thread so pages can render concurrently
+_current_request = ContextVar("current_request", default=None)
+
 class TeambeeApp:
     """Main application class for the Teambee website."""
     
+    # Map of review author names to their corresponding image files
+    author_images = {
+        "Marco & Patricia Kalfshoven": "doit_foto.jpeg",
+        "Rick Sombroek": "rick_foto.jpg",
+        "Jochem van der Linden": "xfit_foto.jpg",
+        "Jasper Appeldoorn": "xfit_foto.jpg",
+        "Jelle Notkamp": "EV_jelle.jpg"
+    }
+    
+    # Browsers always revalidate rendered pages (cheap thanks to the ETag),
+    # shared caches may serve them for a few minutes
+    page_cache_control = "public, max-age=0, must-revalidate, s-maxage=300, stale-while-revalidate=60"
+    
+    # Pages loaded speculatively (Sec-Purpose: prefetch) may be used by the
+    # browser for a few minutes without revalidating, so a language switch
+    # after hovering the dropdown needs no request at all; shared caches
+    # don't store them
+    prefetch_cache_control = "private, max-age=300"
+    
+    # Placeholder for the main content when splitting the page for streaming
+    stream_marker = "__teambee_stream_sections__"
+    
+    # Pages rendered ahead of time whenever the content changes
+    prerender_pages = [("/", "nl"), ("/en", "en")]
+    
+    # Effective connection types (ECT client hint) that get the lite page
+    lite_connection_types = {"slow-2g", "2g", "3g"}
+    
+    # Request headers that select the page variant
+    page_vary = "Save-Data, ECT"
+    
     def __init__(self):
         """Initialize the Teambee application with TailwindCSS."""
         # Generate a global version string for cache busting
         self.version = str(int(time.time()))
-        self.file_versions = {}
+        
+        # Reviews are rendered a page at a time to keep the homepage small
+        self.reviews_page_size = int(os.environ.get("REVIEWS_PAGE_SIZE", 6))
+        
+        # FastHTML's default scripts are served from public/vendor. The site
+        # uses none of them, so none are included unless FRAMEWORK_SCRIPTS
+        # lists them (e.g. "htmx,fasthtml")
+        self.vendor = VendorScripts(os.path.join(os.path.dirname(os.path.abspath(__file__)), "public", "vendor"))
+        self.vendor_scripts = [
+            name.strip()
+            for name in os.environ.get("FRAMEWORK_SCRIPTS", "").split(",")
+            if name.strip() in VENDOR_SCRIPTS
+        ]
+        script_origins = self.vendor.external_origins(self.vendor_scripts)
+        if script_origins:
+            print(f"Not all framework scripts are vendored, loading them from {', '.join(script_origins)}")
+        
+        # Concurrency limit and per-client rate limits, checked before anything else
+        self.shedder = LoadShedder(
+            max_concurrent=int(os.environ.get("MAX_CONCURRENT_REQUESTS", 32)),
+            max_queue=int(os.environ.get("MAX_QUEUED_REQUESTS", 64)),
+            max_wait=float(os.environ.get("MAX_QUEUE_WAIT", 1.0))
+        )
+        
+        # Structured access log, written in the background (replaces uvicorn's)
+        self.access_log = AccessLog(
+            path=os.environ.get("ACCESS_LOG_PATH") or None,
+            static_sample_rate=float(os.environ.get("ACCESS_LOG_STATIC_SAMPLE_RATE", 0.1))
+        )
         
         # Define middleware
         middleware = [
-            Middleware(SecurityHeadersMiddleware),
+            Middleware(AccessLogMiddleware, access_log=self.access_log),
+            Middleware(
+                LoadSheddingMiddleware,
+                shedder=self.shedder,
+                is_exempt=self.exempt_from_limits
+            ),
+            Middleware(SecurityHeadersMiddleware, script_origins=script_origins),
             Middleware(LanguageMiddleware)
         ]
         
@@ -105,55 +195,520 @@ class TeambeeApp:
         if os.environ.get("ENVIRONMENT", "development") == "production":
             middleware.append(Middleware(CustomHTTPSRedirectMiddleware))
         
-        # Load translations
-        self.translations = {}
-        self.load_translations()
+        # Load translations, data files and asset versions; a background
+        # watcher swaps in fresh snapshots when they change on disk
+        self.content = ContentStore(os.path.dirname(os.path.abspath(__file__)))
+        self.content.on_reload.append(self.prerender)
+        
+        # In-memory search over the reviews and success stories; only the
+        # documents that changed are indexed again on a reload
+        self.search_index, _ = SearchIndex().updated(self.search_documents(self.content.snapshot))
+        self.search_results = int(os.environ.get("SEARCH_RESULTS", 8))
+        self.search_query_length = 100
+        self.content.on_reload.append(self.update_search_index)
+        
+        # Responses are tagged with surrogate keys; when a purge endpoint is
+        # configured, the keys of changed content are purged at the CDN once
+        # the new snapshot is live, so the CDN can cache for a long time
+        purge_url = os.environ.get("CDN_PURGE_URL")
+        self.cdn = None
+        if purge_url:
+            self.cdn = CDNPurger(purge_url, self.content.snapshot, token=os.environ.get("CDN_PURGE_TOKEN"))
+            self.content.after_reload.append(self.cdn.after_reload)
+        
+        # Concurrent cache misses for the same page share a single render
+        self.render_flight = SingleFlight()
+        
+        # Rendered case study bodies by slug, language, variant and content
+        # digest; they outlive snapshots, so a reload only re-renders the
+        # stories that changed
+        self.case_bodies = {}
+        
+        # Stream uncached pages so the head and hero reach the browser early
+        self.stream_pages = os.environ.get("STREAM_PAGES", "true").lower() == "true"
+        
+        # Optionally minify rendered HTML before it is cached and sent
+        self.minify_pages = os.environ.get("MINIFY_HTML", "false").lower() == "true"
+        
+        # Pages depend on the code as well as the content, so a deploy that
+        # only changes the templates must change the ETags too
+        self.code_version = self._code_version()
+        
+        # Client portal logins; password hashing runs on its own small pool
+        self.hasher = PasswordHasher(
+            max_workers=int(os.environ.get("AUTH_HASH_WORKERS", 2)),
+            max_pending=int(os.environ.get("AUTH_HASH_QUEUE", 64))
+        )
+        self.auth = AuthStore(os.environ.get("AUTH_DB_PATH", "auth.db"))
+        self.portal_url = os.environ.get("PORTAL_URL", "/")
+        
+        # Contact requests are answered right away, then stored and sent on
+        # in the background; without a webhook they are only logged
+        webhook_url = os.environ.get("LEAD_WEBHOOK_URL")
+        self.leads = LeadQueue(
+            os.environ.get("LEADS_DB_PATH", "leads.db"),
+            WebhookNotifier(webhook_url) if webhook_url else LogNotifier()
+        )
             
         self.app = FastHTML(
-            hdrs=[
-                # Meta tags for SEO
-                Meta(name="description", content="Teambee helps premium high-end fitness clubs transform members into loyal ambassadors through personalized attention at scale."),
-                Meta(name="keywords", content="fitness clubs, member retention, loyalty, personalized experience, teambee"),
-                Meta(name="viewport", content="width=device-width, initial-scale=1.0"),
-                Meta(property="og:title", content="Teambee | Transform Members into Loyal Ambassadors"),
-                Meta(property="og:description", content="Help your fitness club members become loyal ambassadors through personalized attention at scale."),
-                Meta(property="og:type", content="website"),
-                Meta(property="og:url", content="https://teambee.fit"),
-                # Language-specific meta tags
-                Link(rel="alternate", hreflang="nl", href="https://teambee.fit/"),
-                Link(rel="alternate", hreflang="en", href="https://teambee.fit/en"),
-                Link(rel="alternate", hreflang="x-default", href="https://teambee.fit/"),
-                # Stylesheets
-                Link(rel="stylesheet", href=self.versioned_url("/static/app.css"), type="text/css"),
-                Link(rel="icon", href=self.versioned_url("/static/assets/Teambee icon.png"), type="image/png"),
-                # Scripts
-                Script(src=self.versioned_url("/static/js/parallax.js")),
-                Script(src=self.versioned_url("/static/js/success-stories.js")),
-                Script(src=self.versioned_url("/static/js/carousel.js")),
-                Script(src=self.versioned_url("/static/js/language-dropdown.js")),
-                Script(src=self.versioned_url("/static/js/smooth-scroll.js")),
-                Script(src=self.versioned_url("/static/js/scroll-animations.js")),
-            ],
-            middleware=middleware
+            hdrs=self._create_hdrs(),
+            default_hdrs=False,
+            middleware=middleware,
+            on_startup=[self.startup],
+            on_shutdown=[self.content.stop, self.leads.stop, self.shutdown, self.access_log.stop]
         )
         
         # Setup routes first to ensure they take precedence over static files
         self.setup_routes()
         
-        # Mount static files after routes are defined
-        self.app.mount("/static", StaticFiles(directory="public"), name="static")
+        # Mount static files after routes are defined; vendored files have
+        # content hashes in their names and can be cached for good. Small
+        # files are served from memory until the content on disk changes.
+        self.vendor_static = ImmutableStaticFiles(
+            directory=self.vendor.directory,
+            surrogate_keys=lambda path: static_file_keys(f"public/vendor/{path}")
+        )
+        self.static = CachedStaticFiles(
+            directory="public",
+            surrogate_keys=lambda path: static_file_keys(f"public/{path}")
+        )
+        self.content.on_reload.append(self.clear_static_caches)
+        self.app.mount("/static/vendor", self.vendor_static, name="vendor")
+        self.app.mount("/static", self.static, name="static")
+    
+    def _create_hdrs(self, lite=False, path=""):
+        """Create the document head contents shared by all pages.
+        
+        The lite variant leaves out the purely decorative scripts. `path` is
+        the page's path without the language prefix ("" for the homepage).
+        """
+        return [
+            *def_hdrs(htmx=False, surreal=False),
+            *self.vendor.scripts(self.vendor_scripts),
+            # Meta tags for SEO
+            Meta(name="description", content="Teambee helps premium high-end fitness clubs transform members into loyal ambassadors through personalized attention at scale."),
+            Meta(name="keywords", content="fitness clubs, member retention, loyalty, personalized experience, teambee"),
+            Meta(name="viewport", content="width=device-width, initial-scale=1.0"),
+            Meta(property="og:title", content="Teambee | Transform Members into Loyal Ambassadors"),
+            Meta(property="og:description", content="Help your fitness club members become loyal ambassadors through personalized attention at scale."),
+            Meta(property="og:type", content="website"),
+            Meta(property="og:url", content=f"https://teambee.fit{path}"),
+            # Language-specific meta tags
+            Link(rel="alternate", hreflang="nl", href=f"https://teambee.fit{path or '/'}"),
+            Link(rel="alternate", hreflang="en", href=f"https://teambee.fit/en{path}"),
+            Link(rel="alternate", hreflang="x-default", href=f"https://teambee.fit{path or '/'}"),
+            # Stylesheets
+            Link(rel="stylesheet", href=self.versioned_url("/static/app.css"), type="text/css"),
+            Link(rel="icon", href=self.versioned_url("/static/assets/Teambee icon.png"), type="image/png"),
+            # Scripts
+            Script(src=self.versioned_url("/static/js/frame-scheduler.js")),
+            None if lite else Script(src=self.versioned_url("/static/js/parallax.js")),
+            Script(src=self.versioned_url("/static/js/success-stories.js")),
+            Script(src=self.versioned_url("/static/js/carousel.js")),
+            Script(src=self.versioned_url("/static/js/language-dropdown.js")),
+            Script(src=self.versioned_url("/static/js/smooth-scroll.js")),
+            Script(src=self.versioned_url("/static/js/contact-form.js")),
+            Script(src=self.versioned_url("/static/js/search.js")),
+            None if lite else Script(src=self.versioned_url("/static/js/scroll-animations.js")),
+        ]
+    
+    async def startup(self):
+        """Pre-render the pages and start watching the content on disk."""
+        await self.access_log.start()
+        await self.leads.start()
+        await self.prerender(self.content.snapshot)
+        await self.content.start()
+        await asyncio.to_thread(self.auth.purge_expired)
+    
+    @property
+    def request(self):
+        """The request currently being rendered."""
+        return _current_request.get()
+    
+    @request.setter
+    def request(self, request):
+        _current_request.set(request)
+    
+    @property
+    def snapshot(self):
+        """The content snapshot the current request is rendered from."""
+        current_request = getattr(self, 'request', None)
+        if current_request is not None:
+            snapshot = getattr(current_request.state, "content", None)
+            if snapshot is not None:
+                return snapshot
+        return self.content.snapshot
+    
+    @property
+    def translations(self):
+        """Translations of the current content snapshot."""
+        return self.snapshot.translations
+    
+    @property
+    def lite(self):
+        """Whether the lite page variant is being rendered."""
+        current_request = getattr(self, 'request', None)
+        return getattr(current_request.state, "lite", False) if current_request else False
+    
+    def wants_lite(self, request):
+        """Check the Save-Data and ECT client hints for a slow or metered connection."""
+        if request.headers.get("save-data", "").strip().lower() == "on":
+            return True
+        return request.headers.get("ect", "").strip().lower() in self.lite_connection_types
+    
+    def bind_request(self, request):
+        """Store the request for translation context and pin its snapshot."""
+        request.state.content = self.content.snapshot
+        self.request = request
+        return request.state.content
+    
+    def _synthetic_request(self, path, lang, snapshot):
+        """Build a request to render a page outside of a real request."""
+        request = Request({
+            "type": "http",
+            "method": "GET",
+            "scheme": "https",
+            "server": ("teambee.fit", 443),
+            "path": path,
+            "query_string": b"",
+            "headers": [],
+        })
+        request.state.language = lang
+        request.state.content = snapshot
+        return request
+    
+    async def shutdown(self):
+        """Release the login resources."""
+        self.hasher.shutdown()
+        self.auth.close()
+    
+    async def current_user(self, request):
+        """Return the email of the logged in user, or None."""
+        return await asyncio.to_thread(self.auth.session_user, request.session.get("auth"))
+    
+    def exempt_from_limits(self, path):
+        """Health checks and static files served from memory are never limited."""
+        if path == "/health":
+            return True
+        if path.startswith("/static/vendor/"):
+            return self.vendor_static.is_cached(path.removeprefix("/static/vendor/"))
+        if path.startswith("/static/"):
+            return self.static.is_cached(path.removeprefix("/static/"))
+        return False
+    
+    async def clear_static_caches(self, snapshot):
+        """Drop the static files cached in memory when public/ changes."""
+        self.static.clear()
+        self.vendor_static.clear()
+    
+    async def prerender(self, snapshot):
+        """Render the main pages for a snapshot before it is published."""
+        for path, lang in self.prerender_pages:
+            request = self._synthetic_request(path, lang, snapshot)
+            snapshot.pages[self._page_key(path, lang)] = await asyncio.to_thread(self.render_page, request)
+        await asyncio.to_thread(self.prerender_cases, snapshot)
+    
+    def search_documents(self, snapshot):
+        """Return the documents to search (lang -> doc_id -> document) of a snapshot."""
+        def text(value, lang):
+            # Missing translations fall back to Dutch
+            if isinstance(value, dict):
+                return value.get(lang) or value.get("nl", "")
+            return str(value or "")
+        
+        documents = {}
+        for lang in self.content.languages:
+            docs = documents[lang] = {}
+            for review in snapshot.reviews:
+                # Keyed by author and role, so editing one language leaves the other alone
+                doc_id = base_id = "review:" + slugify(f"{text(review.get('author'), 'nl')} {text(review.get('title'), 'nl')}")
+                suffix = 2
+                while doc_id in docs:
+                    doc_id = f"{base_id}-{suffix}"
+                    suffix += 1
+                docs[doc_id] = {
+                    "kind": "review",
+                    "title": text(review.get("author"), lang),
+                    "subtitle": text(review.get("title"), lang),
+                    "body": text(review.get("quote"), lang),
+                }
+            for slug, story in snapshot.cases.items():
+                docs[f"case:{slug}"] = {
+                    "kind": "case",
+                    "slug": slug,
+                    "title": text(story.get("title"), lang),
+                    "subtitle": text(story.get("subtitle"), lang),
+                    "body": text(story.get("strategy"), lang) + "\n" + text(story.get("conclusion"), lang),
+                }
+        return documents
+    
+    async def update_search_index(self, snapshot):
+        """Index the documents that changed in a snapshot before it is published."""
+        self.search_index, _ = await asyncio.to_thread(self.search_index.updated, self.search_documents(snapshot))
+    
+    def load_reviews(self):
+        """Return the reviews of the current content snapshot."""
+        return self.snapshot.reviews
+    
+    @staticmethod
+    def _code_version():
+        """Digest of the application's Python modules."""
+        digest = hashlib.sha1()
+        app_dir = os.path.dirname(os.path.abspath(__file__))
+        for name in sorted(os.listdir(app_dir)):
+            if name.endswith(".py"):
+                with open(os.path.join(app_dir, name), "rb") as f:
+                    digest.update(name.encode() + b"\0" + f.read())
+        return digest.hexdigest()[:16]
+    
+    def page_etag(self, lang, lite=False, path=None):
+        """Return the strong ETag of a page (the homepage by default) in the given language and variant."""
+        # The footer shows the current year, so it is part of the content too;
+        # so are the code and the settings that change the rendered HTML
+        settings = f"{self.minify_pages}:{','.join(self.vendor_scripts)}:{self.reviews_page_size}"
+        key = f"{self.code_version}:{settings}:{self.snapshot.version}:{datetime.now().year}:{lang}:{'lite' if lite else 'full'}"
+        if path:
+            key += f":{path}"
+        return '"' + hashlib.sha1(key.encode()).hexdigest()[:20] + '"'
+    
+    @staticmethod
+    def etag_matches(if_none_match, etag):
+        """Check an If-None-Match header value against an ETag."""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        # If-None-Match uses weak comparison, so W/ prefixes are ignored
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return etag in candidates
+    
+    @staticmethod
+    def _page_key(path, lang, lite=False):
+        """Key of a rendered page in the snapshot's page cache."""
+        return (path, lang, lite, datetime.now().year)
+    
+    def iter_page_chunks(self, request):
+        """Render the homepage document piece by piece.
+        
+        The first chunk holds the head and the header, followed by one chunk
+        per main content section and finally the footer and closing tags.
+        """
+        self.request = request  # Store request for translation context
+        canonical = "https://teambee.fit/en" if request.state.language == "en" else "https://teambee.fit/"
+        shell = to_xml(Html(
+            Head(Title("Teambee"), Link(rel="canonical", href=canonical), *self._create_hdrs(lite=self.lite)),
+            Body(self._create_page_shell(self.stream_marker))
+        ))
+        head, tail = shell.split(self.stream_marker)
+        yield head
+        
+        for build in self._homepage_sections():
+            self.request = request
+            yield to_xml(build())
+        
+        yield tail
+    
+    def iter_page_output(self, request):
+        """Render the homepage chunks as they are sent, minified if enabled."""
+        if not self.minify_pages:
+            yield from self.iter_page_chunks(request)
+            return
+        
+        minifier = HTMLMinifier()
+        for chunk in self.iter_page_chunks(request):
+            output = minifier.feed(chunk)
+            if output:
+                yield output
+        tail = minifier.close()
+        if tail:
+            yield tail
+    
+    def render_page(self, request):
+        """Render the full homepage document for a request."""
+        return "".join(self.iter_page_output(request))
     
-    def load_translations(self):
-        """Load translations from JSON files."""
-        translations_dir = os.path.join(os.path.dirname(__file__), "translations")
-        for lang in ["nl", "en"]:
-            file_path = os.path.join(translations_dir, f"{lang}.json")
+    async def stream_page(self, request, snapshot):
+        """Stream the homepage while rendering it into the page cache.
+        
+        Takes part in the render single-flight: if the page is already being
+        rendered, the finished page is sent in one piece instead.
+        """
+        key = self._page_key(request.url.path, request.state.language, request.state.lite)
+        chunks = asyncio.Queue()
+        
+        async def render():
+            parts = []
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    self.translations[lang] = json.load(f)
-            except (FileNotFoundError, json.JSONDecodeError) as e:
-                print(f"Error loading translations for {lang}: {e}")
-                self.translations[lang] = {}
+                page_chunks = self.iter_page_output(request)
+                while (chunk := await asyncio.to_thread(next, page_chunks, None)) is not None:
+                    parts.append(chunk)
+                    chunks.put_nowait(chunk)
+            finally:
+                chunks.put_nowait(None)
+            html = snapshot.pages[key] = "".join(parts)
+            return html
+        
+        task, leader = self.render_flight.start((*key, snapshot.version), render)
+        if not leader:
+            yield await asyncio.shield(task)
+            return
+        
+        while (chunk := await chunks.get()) is not None:
+            yield chunk
+        # Surface render errors that ended the stream early
+        await asyncio.shield(task)
+    
+    async def cached_page(self, request, snapshot, render_page=None):
+        """Return the rendered page for a request from the snapshot's cache.
+        
+        On a miss the page is rendered in a worker thread (by `render_page`,
+        the homepage by default); concurrent misses for the same route,
+        language and content version wait for that one render instead of
+        starting their own.
+        """
+        render_page = render_page or self.render_page
+        key = self._page_key(request.url.path, request.state.language, request.state.lite)
+        html = snapshot.pages.get(key)
+        if html is not None:
+            return html
+        
+        async def render():
+            html = await asyncio.to_thread(render_page, request)
+            snapshot.pages[key] = html
+            return html
+        
+        return await self.render_flight.do((*key, snapshot.version), render)
+    
+    async def page_response(self, request):
+        """Return the homepage, or 304 Not Modified if the client has it."""
+        snapshot = self.bind_request(request)
+        lang = request.state.language
+        lite = request.state.lite = self.wants_lite(request)
+        etag = self.page_etag(lang, lite)
+        headers = self.page_headers(request, etag, page_keys(lang, sorted(snapshot.data)))
+        
+        if self.etag_matches(request.headers.get("if-none-match"), etag):
+            request.state.cache = "revalidated"
+            return Response(status_code=304, headers=headers)
+        
+        key = self._page_key(request.url.path, lang, lite)
+        request.state.cache = "hit" if key in snapshot.pages else "miss"
+        if self.stream_pages and key not in snapshot.pages:
+            return StreamingResponse(
+                self.stream_page(request, snapshot),
+                media_type="text/html; charset=utf-8",
+                headers=headers
+            )
+        
+        html = await self.cached_page(request, snapshot)
+        return HTMLResponse(html, headers=headers)
+    
+    @staticmethod
+    def is_speculative(request):
+        """Check whether the browser is prefetching or prerendering the page."""
+        return "prefetch" in request.headers.get("sec-purpose", "")
+    
+    def page_headers(self, request, etag, keys):
+        """Response headers of a rendered page."""
+        return {
+            "ETag": etag,
+            "Cache-Control": self.prefetch_cache_control if self.is_speculative(request) else self.page_cache_control,
+            # Caches keep the lite and full variants apart; browsers are
+            # asked to send ECT on later requests
+            "Vary": self.page_vary,
+            "Accept-CH": "ECT",
+            **surrogate_headers(keys),
+        }
+    
+    def case_url(self, slug):
+        """URL of a case study page in the current language."""
+        return f"/en/cases/{slug}" if self.request.state.language == "en" else f"/cases/{slug}"
+    
+    def case_digest(self, snapshot, slug, lang):
+        """Digest of everything the body of a case study page is rendered from."""
+        story = snapshot.cases[slug]
+        image = story.get("image", "").replace("/static/", "public/", 1)
+        small = image.replace("public/assets/", "public/assets/small/", 1)
+        parts = [
+            # Only this language's texts, so editing the other one doesn't count
+            {
+                name: value.get(lang) if isinstance(value, dict) and lang in value else value
+                for name, value in story.items()
+            },
+            snapshot.translations.get(lang, {}).get("cases"),
+            # Missing labels fall back to Dutch
+            snapshot.translations.get("nl", {}).get("cases"),
+            snapshot.translations.get(lang, {}).get("services", {}).get("cta"),
+            snapshot.images.get(image),
+            snapshot.file_versions.get(image),
+            snapshot.file_versions.get(small),
+        ]
+        return hashlib.sha1(json.dumps(parts, sort_keys=True).encode()).hexdigest()[:16]
+    
+    def render_case_body(self, request, slug):
+        """Render the main content of a case study page, reusing earlier renders."""
+        self.request = request
+        lang = request.state.language
+        key = (slug, lang, self.lite, self.case_digest(self.snapshot, slug, lang))
+        html = self.case_bodies.get(key)
+        if html is None:
+            html = self.case_bodies[key] = to_xml(self._create_case_study(self.snapshot.cases[slug]))
+        return html
+    
+    def render_case_page(self, request, slug):
+        """Render a case study page around its (usually cached) body."""
+        self.request = request
+        story = self.snapshot.cases[slug]
+        lang = request.state.language
+        path = f"/cases/{slug}"
+        canonical = f"https://teambee.fit/en{path}" if lang == "en" else f"https://teambee.fit{path}"
+        title = story.get("title", {}).get(lang, "")
+        shell = to_xml(Html(
+            Head(
+                Title(f"{title} | Teambee"),
+                Link(rel="canonical", href=canonical),
+                *self._create_hdrs(lite=self.lite, path=path)
+            ),
+            Body(self._create_page_shell(self.stream_marker))
+        ))
+        head, tail = shell.split(self.stream_marker)
+        html = head + self.render_case_body(request, slug) + tail
+        return minify_html(html) if self.minify_pages else html
+    
+    def prerender_cases(self, snapshot):
+        """Render the case study bodies that changed and forget the outdated ones (blocking)."""
+        current = set()
+        for slug in snapshot.cases:
+            for lang in self.content.languages:
+                digest = self.case_digest(snapshot, slug, lang)
+                current.add((slug, lang, digest))
+                if (slug, lang, False, digest) not in self.case_bodies:
+                    self.render_case_body(self._synthetic_request(f"/cases/{slug}", lang, snapshot), slug)
+        
+        for key in list(self.case_bodies):
+            slug, lang, lite, digest = key
+            if (slug, lang, digest) not in current:
+                self.case_bodies.pop(key, None)
+    
+    async def case_response(self, request, slug):
+        """Return a case study page, or 304 Not Modified if the client has it."""
+        snapshot = self.bind_request(request)
+        if slug not in snapshot.cases:
+            return PlainTextResponse("Not Found", status_code=404)
+        
+        lang = request.state.language
+        lite = request.state.lite = self.wants_lite(request)
+        etag = self.page_etag(lang, lite, path=f"/cases/{slug}")
+        headers = self.page_headers(request, etag, [*page_keys(lang), f"case:{slug}"])
+        
+        if self.etag_matches(request.headers.get("if-none-match"), etag):
+            request.state.cache = "revalidated"
+            return Response(status_code=304, headers=headers)
+        
+        key = self._page_key(request.url.path, lang, lite)
+        request.state.cache = "hit" if key in snapshot.pages else "miss"
+        html = await self.cached_page(request, snapshot, lambda request: self.render_case_page(request, slug))
+        return HTMLResponse(html, headers=headers)
     
     def get_text(self, section, key, default=""):
         """Get text in the current language."""
@@ -174,33 +729,68 @@ class TeambeeApp:
     def versioned_url(self, path):
         """Add version parameter to URL for cache busting.
         
-        For static files, the version is based on the file's modification time or hash.
+        For static files, the version is the file's modification time as
+        recorded in the current content snapshot.
         For non-file paths, the global version is used.
         """
         if path.startswith("/static/"):
-            # Get file-specific version based on modification time or hash
+            # Look up the file-specific version, falling back to the global version
             file_path = path.replace("/static/", "public/")
-            
-            # Check the cache first
-            if file_path in self.file_versions:
-                version = self.file_versions[file_path]
-            else:
-                try:
-                    # Use last modification time for the file
-                    if os.path.exists(file_path):
-                        version = str(int(os.path.getmtime(file_path)))
-                        self.file_versions[file_path] = version
-                    else:
-                        version = self.version
-                except:
-                    # Fallback to the global version
-                    version = self.version
-                    
+            version = self.snapshot.file_versions.get(file_path, self.version)
             return f"{path}?v={version}"
         else:
             # For non-static paths, use the global version
             return f"{path}?v={self.version}"
     
+    def _image_path(self, file_name):
+        """Path of an image in public/assets, relative to the project root.
+        
+        The lite page uses the small variant from public/assets/small when
+        there is one (see scripts/image_variants.py).
+        """
+        small_path = f"public/assets/small/{file_name}"
+        if self.lite and small_path in self.snapshot.file_versions:
+            return small_path
+        return f"public/assets/{file_name}"
+    
+    def image_url(self, file_name):
+        """Versioned URL of an image in public/assets."""
+        return self.versioned_url("/static/" + self._image_path(file_name).removeprefix("public/"))
+    
+    def image(self, file_name, alt, cls="", lazy=True, **kwargs):
+        """Create an image from public/assets with its intrinsic size.
+        
+        The width and height let the browser reserve space before the image
+        loads, and large photos show a blurred placeholder meanwhile. Images
+        below the fold are loaded lazily.
+        """
+        size = self.snapshot.images.get(self._image_path(file_name), {})
+        # Placeholders are generated for the original, not the small variant
+        placeholder = self.snapshot.images.get(f"public/assets/{file_name}", {})
+        if "placeholder" in placeholder:
+            kwargs["style"] = self.placeholder_style(placeholder)
+        return Img(
+            src=self.image_url(file_name),
+            alt=alt,
+            width=size.get("width"),
+            height=size.get("height"),
+            decoding="async",
+            loading="lazy" if lazy else None,
+            cls=cls,
+            **kwargs
+        )
+    
+    @staticmethod
+    def placeholder_style(entry):
+        """Inline style painting an image's placeholder behind it until it loads."""
+        return f"background:{entry['color']} url({entry['placeholder']}) center/cover no-repeat"
+    
+    def icon(self, name, alt, cls=""):
+        """Draw an icon from the inline sprite, or as an image if it isn't in it."""
+        if name not in self.snapshot.icons:
+            return self.image(f"{name}.svg", alt, cls=cls)
+        return Svg(Use(href=f"#icon-{name}"), role="img", aria_label=alt, cls=cls)
+    
     def setup_routes(self):
         """Set up the application routes."""
         rt = self.app.route
@@ -213,20 +803,128 @@ class TeambeeApp:
         @rt("/")
         async def home(request):
             """Render the home page in Dutch (default)."""
-            self.request = request  # Store request for translation context
-            return Title("Teambee"), self.create_homepage()
+            return await self.page_response(request)
         
         @rt("/en")
         async def home_en(request):
             """Render the home page in English."""
-            self.request = request  # Store request for translation context
-            return Title("Teambee"), self.create_homepage()
+            return await self.page_response(request)
+        
+        @rt("/metrics")
+        async def metrics(request):
+            """Expose internal counters as JSON."""
+            return JSONResponse({
+                "render_singleflight": self.render_flight.stats(),
+                "static_cache": self.static.stats(),
+                "load_shedding": self.shedder.stats(),
+                "access_log": self.access_log.stats(),
+                "contact_requests": self.leads.stats(),
+                "cdn_purge": self.cdn.stats() if self.cdn else None,
+                "search_index": self.search_index.stats(),
+            })
+        
+        @rt("/login", methods=["post"])
+        async def login(request):
+            """Log in with email and password and start a session."""
+            # Already logged in: no need to check (and hash) a password again
+            if await self.current_user(request):
+                return RedirectResponse(url=self.portal_url, status_code=303)
+            
+            form = await request.form()
+            email = str(form.get("email", "")).strip()
+            password = str(form.get("password", ""))
+            if not email or not password:
+                return PlainTextResponse("Email and password are required", status_code=400)
+            
+            # Logins don't hold a request slot while they wait for the
+            # hashing pool (see LoadShedder.unslotted), so its queue is the limit
+            if self.hasher.busy():
+                return PlainTextResponse("Server busy, please try again shortly", status_code=503, headers={"Retry-After": "1"})
+            
+            password_hash = await asyncio.to_thread(self.auth.password_hash, email)
+            if not await self.hasher.verify_async(password, password_hash):
+                return PlainTextResponse("Invalid email or password", status_code=401)
+            
+            request.session["auth"] = await asyncio.to_thread(self.auth.create_session, email)
+            return RedirectResponse(url=self.portal_url, status_code=303)
+        
+        @rt("/logout", methods=["post"])
+        async def logout(request):
+            """End the current session."""
+            token = request.session.pop("auth", None)
+            if token:
+                await asyncio.to_thread(self.auth.delete_session, token)
+            return RedirectResponse(url="/", status_code=303)
+        
+        @rt("/contact", methods=["post"])
+        async def contact(request):
+            """Accept a contact or demo request; it is stored and sent on in the background."""
+            self.bind_request(request)
+            form = await request.form()
+            lead, errors = validate_lead(form)
+            wants_json = "application/json" in request.headers.get("accept", "")
+            
+            if errors:
+                if wants_json:
+                    return JSONResponse({"errors": errors}, status_code=400)
+                return self.contact_result_page(self.get_text("contact", "invalid"), status_code=400)
+            
+            # Submissions caught by the honeypot are answered like any other
+            if lead is not None:
+                lead["lang"] = request.state.language
+                lead["created"] = time.time()
+                if not self.leads.submit(lead):
+                    headers = {"Retry-After": "5"}
+                    if wants_json:
+                        return JSONResponse({"errors": {}}, status_code=503, headers=headers)
+                    return self.contact_result_page(self.get_text("contact", "error"), status_code=503, headers=headers)
+            
+            if wants_json:
+                return JSONResponse({"ok": True}, status_code=202)
+            return self.contact_result_page(self.get_text("contact", "sent"))
+        
+        @rt("/cases/{slug}")
+        async def case_study(request, slug: str):
+            """Render a success story on its own page, in Dutch or (under /en) English."""
+            return await self.case_response(request, slug)
         
         @rt("/en/")
         async def home_en_slash(request):
             """Redirect /en/ to /en."""
             return RedirectResponse(url="/en", status_code=301)
         
+        @rt("/reviews/slides")
+        async def review_slides(request):
+            """Return the next page of review slides for the carousel."""
+            self.bind_request(request)
+            request.state.lite = self.wants_lite(request)
+            try:
+                offset = int(request.query_params.get("offset", 0))
+            except ValueError:
+                offset = 0
+            return HTMLResponse(
+                self.render_review_slides(offset),
+                headers={
+                    "Cache-Control": "public, max-age=300",
+                    "Vary": self.page_vary,
+                    **surrogate_headers(page_keys(request.state.language, ["reviews"]))
+                }
+            )
+        
+        @rt("/search")
+        async def search(request):
+            """Return the reviews and success stories matching ?q= as an HTML fragment."""
+            self.bind_request(request)
+            query = request.query_params.get("q", "")[:self.search_query_length]
+            results = self.search_index.search(request.state.language, query, self.search_results)
+            return HTMLResponse(
+                to_xml(self._create_search_results(query, results)),
+                headers={
+                    "Cache-Control": "public, max-age=300",
+                    **surrogate_headers(page_keys(request.state.language, ["reviews", "success_stories"]))
+                }
+            )
+        
         # Add a route to detect browser language and redirect accordingly
         @rt("/detect-language")
         async def detect_language(request):
@@ -242,13 +940,42 @@ class TeambeeApp:
     
     def create_homepage(self):
         """Create the Teambee homepage."""
+        return self._create_page_shell(*[build() for build in self._homepage_sections()])
+    
+    def _homepage_sections(self):
+        """Return the builders of the main content, in page order."""
+        return [
+            # Hero Section
+            self._create_hero_section,
+            # Jumping arrow between hero and about sections
+            self._create_scroll_arrow,
+            # About Section
+            self._create_about_section,
+            # Services Section
+            self._create_services_section,
+            # Benefits Section
+            self._create_benefits_section,
+            # Reviews Section
+            self._create_reviews_section,
+            # Contact / demo request Section
+            self._create_contact_section,
+            # Login Section
+            self._create_login_section,
+        ]
+    
+    def _create_page_shell(self, *content):
+        """Create the page layout around the main content."""
         return Div(
-            # Honeycomb pattern background
-            Div(
-                Img(
-                    src=self.versioned_url("/static/assets/honeycomb-cropped.svg"),
-                    alt="Honeycomb Pattern",
-                    cls="fixed top-16 w-[200%] h-[40vh] object-cover opacity-15 dark:opacity-10 z-0 pointer-events-none parallax"
+            # Icons used throughout the page, drawn with <use>
+            NotStr(self.snapshot.icons.markup()),
+            
+            # Honeycomb pattern background, left out of the lite page
+            None if self.lite else Div(
+                self.image(
+                    "honeycomb-cropped.svg",
+                    "Honeycomb Pattern",
+                    cls="fixed top-16 w-[200%] h-[40vh] object-cover opacity-15 dark:opacity-10 z-0 pointer-events-none parallax",
+                    lazy=False
                 ),
                 cls="fixed top-0 left-0 right-0 w-full h-screen"
             ),
@@ -258,34 +985,7 @@ class TeambeeApp:
             
             # Main content
             Main(
-                # Hero Section
-                self._create_hero_section(),
-                
-                # Jumping arrow between hero and about sections
-                Div(
-                    Img(
-                        src=self.versioned_url("/static/assets/arrow-sm-down.svg"),
-                        alt="Scroll down",
-                        cls="w-12 h-12 mx-auto mb-8 animate-bounce opacity-50"
-                    ),
-                    cls="text-center -mt-8"
-                ),
-                
-                # About Section
-                self._create_about_section(),
-                
-                # Services Section
-                self._create_services_section(),
-                
-                # Benefits Section
-                self._create_benefits_section(),
-                
-                # Reviews Section
-                self._create_reviews_section(),
-                
-                # Login Section
-                self._create_login_section(),
-                
+                *content,
                 cls="flex-1 relative z-0",
                 role="main",
                 aria_label="Main content"
@@ -297,6 +997,13 @@ class TeambeeApp:
             cls="flex min-h-screen flex-col relative"
         )
     
+    def _create_scroll_arrow(self):
+        """Create the jumping arrow between the hero and about sections."""
+        return Div(
+            self.icon("arrow-sm-down", "Scroll down", cls="w-12 h-12 mx-auto mb-8 animate-bounce opacity-50"),
+            cls="text-center -mt-8"
+        )
+    
     def _create_header(self):
         """Create the header section."""
         # Determine the current language and alternate language URL
@@ -317,7 +1024,7 @@ class TeambeeApp:
             Div(
                 Div(
                     A(
-                        Img(src=self.versioned_url("/static/assets/Teambee logo donker.png"), alt="Teambee Logo", cls="h-8 sm:h-10 w-auto"),
+                        self.image("Teambee logo donker.png", "Teambee Logo", cls="h-8 sm:h-10 w-auto", lazy=False),
                         href="/" if current_lang == "nl" else "/en",
                         title="Back to top",
                         aria_label="Back to top of page",
@@ -331,14 +1038,13 @@ class TeambeeApp:
                         # Dropdown button
                         Button(
                             Span(current_lang.upper(), cls="mr-1"),
-                            Img(
-                                src=self.versioned_url("/static/assets/dropdown-arrow.svg"),
-                                alt="Language Dropdown",
-                                cls="w-4 h-4"
-                            ),
+                            self.icon("dropdown-arrow", "Language Dropdown", cls="w-4 h-4"),
                             cls="flex items-center justify-center rounded-lg border border-gray-300 px-3 py-1 text-sm font-medium text-gray-700 hover:bg-gray-50 focus:outline-none focus:ring-2 focus:ring-[#3D2E7C] focus:ring-offset-2",
                             id="language-dropdown-button",
                             type="button",
+                            # Loaded ahead by language-dropdown.js when the button
+                            # is hovered or focused; not on the lite page
+                            data_alternate_url=None if self.lite else alt_path,
                             aria_haspopup="true",
                             aria_expanded="false"
                         ),
@@ -352,7 +1058,7 @@ class TeambeeApp:
                             Div(
                                 A(
                                     "Nederlands",
-                                    href="/" if current_lang != "nl" else "#",
+                                    href=alt_path if current_lang != "nl" else "#",
                                     cls=f"block w-full px-4 py-2 text-left text-sm {'text-[#3D2E7C] font-semibold bg-gray-50' if current_lang == 'nl' else 'text-gray-700'} hover:bg-gray-100 hover:text-[#3D2E7C]",
                                     hreflang="nl",
                                     rel="alternate"
@@ -411,11 +1117,12 @@ class TeambeeApp:
                         cls="space-y-6"
                     ),
                     Div(
-                        Img(
-                            src=self.versioned_url("/static/assets/Teambee icon.png"),
-                            alt="Teambee Hero",
-                            cls="w-full h-full object-contain animate-card",
-                            loading="lazy"
+                        # Lazy even though it is in the hero: it is hidden on mobile,
+                        # and lazy images that aren't displayed are never fetched
+                        self.image(
+                            "Teambee icon.png",
+                            "Teambee Hero",
+                            cls="w-full h-full object-contain animate-card"
                         ),
                         cls="relative h-[300px] md:h-[400px] hidden md:flex items-center justify-center"
                     ),
@@ -446,11 +1153,7 @@ class TeambeeApp:
                     # Synergie card
                     Div(
                         Div(
-                            Img(
-                                src=self.versioned_url("/static/assets/users.svg"),
-                                alt="Synergie Icon",
-                                cls="w-6 h-6"
-                            ),
+                            self.icon("users", "Synergie Icon", cls="w-6 h-6"),
                             cls="w-12 h-12 bg-[#E8973A]/20 rounded-full flex items-center justify-center mb-4"
                         ),
                         H3(
@@ -467,11 +1170,7 @@ class TeambeeApp:
                     # Resultaatgericht card
                     Div(
                         Div(
-                            Img(
-                                src=self.versioned_url("/static/assets/target.svg"),
-                                alt="Resultaatgericht Icon",
-                                cls="w-6 h-6"
-                            ),
+                            self.icon("target", "Resultaatgericht Icon", cls="w-6 h-6"),
                             cls="w-12 h-12 bg-[#3D2E7C]/20 rounded-full flex items-center justify-center mb-4"
                         ),
                         H3(
@@ -488,11 +1187,7 @@ class TeambeeApp:
                     # Duurzaam card
                     Div(
                         Div(
-                            Img(
-                                src=self.versioned_url("/static/assets/sprout.svg"),
-                                alt="Duurzaam Icon",
-                                cls="w-6 h-6"
-                            ),
+                            self.icon("sprout", "Duurzaam Icon", cls="w-6 h-6"),
                             cls="w-12 h-12 bg-[#94C46F]/20 rounded-full flex items-center justify-center mb-4"
                         ),
                         H3(
@@ -566,7 +1261,8 @@ class TeambeeApp:
                                 A(
                                     self.get_text("services", "cta"),
                                     cls="inline-flex h-12 items-center justify-center rounded-lg bg-[#94C46F] px-8 py-2 text-base font-medium text-white shadow transition-all duration-300 ease-in-out hover:bg-[#94C46F]/90 hover:scale-105 hover:shadow-lg focus-visible:outline-none focus-visible:ring-2 focus-visible:ring-[#94C46F] focus-visible:ring-offset-2 animate-card",
-                                    data_scroll_to="contact"
+                                    href="#demo-request",
+                                    data_scroll_to="demo-request"
                                 ),
                                 cls="text-center mt-4"
                             ),
@@ -633,11 +1329,7 @@ class TeambeeApp:
     def _create_check_list_item(self, text):
         """Create a check list item with an orange check icon."""
         return Li(
-            Img(
-                src=self.versioned_url("/static/assets/check.svg"),
-                alt="Check",
-                cls="h-6 w-6 mr-2 mt-0.5"
-            ),
+            self.icon("check", "Check", cls="h-6 w-6 mr-2 mt-0.5"),
             Span(text),
             cls="flex items-start animate-stagger-item"
         )
@@ -739,9 +1431,9 @@ class TeambeeApp:
                         *[
                             Div(
                                 A(
-                                    Img(
-                                        src=self.versioned_url(f"/static/assets/{partner['logo']}.png"),
-                                        alt=partner["name"],
+                                    self.image(
+                                        f"{partner['logo']}.png",
+                                        partner["name"],
                                         cls="h-10 md:h-8 w-auto object-contain transition-all duration-300 hover:scale-110 hover:opacity-90"
                                     ),
                                     href=partner["url"],
@@ -766,80 +1458,112 @@ class TeambeeApp:
             cls="pt-16 pb-8 bg-white/80 backdrop-blur-sm"
         )
     
-    def _create_reviews_section(self):
-        """Create the reviews section with client testimonials."""
-        # Load reviews from JSON file
-        reviews_path = os.path.join("public", "data", "reviews.json")
-        try:
-            with open(reviews_path, 'r') as f:
-                reviews = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            reviews = []
-        
-        # Map of author names to their corresponding image files
-        author_images = {
-            "Marco & Patricia Kalfshoven": "doit_foto.jpeg",
-            "Rick Sombroek": "rick_foto.jpg",
-            "Jochem van der Linden": "xfit_foto.jpg",
-            "Jasper Appeldoorn": "xfit_foto.jpg",
-            "Jelle Notkamp": "EV_jelle.jpg"
-        }
-        
+    def _create_review_card(self, review, i):
+        """Create a single review slide for the carousel."""
         # Get current language
         current_lang = self.request.state.language
         
-        # Generate review cards dynamically from the loaded data
-        review_cards = []
-        for i, review in enumerate(reviews):
-            # Get the appropriate image for the author
-            image_file = author_images.get(review["author"]["nl"], "profile-placeholder.svg")
-            
-            # Create the review card
-            review_card = Div(
+        # Get the appropriate image for the author
+        image_file = self.author_images.get(review["author"]["nl"], "profile-placeholder.svg")
+        
+        return Div(
+            Div(
                 Div(
-                    Div(
-                        Img(
-                            src=self.versioned_url("/static/assets/quote.svg"),
-                            alt="Quote",
-                            cls="w-8 h-8 text-[#E8973A]"
-                        ),
-                        # Add translation label for English
-                        Span(
-                            "Translated from Dutch",
-                            cls="text-xs text-gray-400 ml-2 italic" if current_lang == "en" else "hidden",
-                        ),
-                        cls="flex items-center mb-4"
-                    ),
-                    P(
-                        review["quote"][current_lang],
-                        cls="text-gray-600 mb-4 flex-grow"
+                    self.icon("quote", "Quote", cls="w-8 h-8 text-[#E8973A]"),
+                    # Add translation label for English
+                    Span(
+                        "Translated from Dutch",
+                        cls="text-xs text-gray-400 ml-2 italic" if current_lang == "en" else "hidden",
                     ),
+                    cls="flex items-center mb-4"
+                ),
+                P(
+                    review["quote"][current_lang],
+                    cls="text-gray-600 mb-4 flex-grow"
+                ),
+                Div(
                     Div(
+                        self.image(
+                            image_file,
+                            review["author"][current_lang],
+                            cls="w-10 h-10 rounded-full bg-gray-200 mr-3 object-cover"
+                        ),
                         Div(
-                            Img(
-                                src=self.versioned_url(f"/static/assets/{image_file}"),
-                                alt=review["author"][current_lang],
-                                cls="w-10 h-10 rounded-full bg-gray-200 mr-3 object-cover"
+                            Div(
+                                review["author"][current_lang],
+                                cls="font-semibold text-[#1B1947]"
                             ),
                             Div(
-                                Div(
-                                    review["author"][current_lang],
-                                    cls="font-semibold text-[#1B1947]"
-                                ),
-                                Div(
-                                    review["title"][current_lang],
-                                    cls="text-sm text-gray-500"
-                                ),
+                                review["title"][current_lang],
+                                cls="text-sm text-gray-500"
                             ),
                         ),
-                        cls="flex items-center mt-3"
                     ),
-                    cls="bg-white p-6 rounded-lg shadow-sm border border-gray-100 h-full flex flex-col justify-between w-full animate-card"
+                    cls="flex items-center mt-3"
                 ),
-                cls="slide w-full flex-shrink-0 px-4",
-                id=f"review-{i}"  # Add unique ID for each review
-            )
-            review_cards.append(review_card)
+                cls="bg-white p-6 rounded-lg shadow-sm border border-gray-100 h-full flex flex-col justify-between w-full animate-card"
+            ),
+            cls="slide w-full flex-shrink-0 px-4",
+            id=f"review-{i}"  # Add unique ID for each review
+        )
+    
+    def render_review_slides(self, offset):
+        """Render one page of review slides as an HTML fragment.
+        
+        Pages are cached per language, variant and offset in the content
+        snapshot, so they are rebuilt only when reviews.json changes.
+        """
+        reviews = self.load_reviews()
+        fragments = self.snapshot.review_fragments
+        current_lang = self.request.state.language
+        offset = max(0, min(offset, len(reviews)))
+        
+        key = (current_lang, self.lite, offset)
+        self.request.state.cache = "hit" if key in fragments else "miss"
+        if key not in fragments:
+            page = reviews[offset:offset + self.reviews_page_size]
+            html = to_xml(tuple(
+                self._create_review_card(review, offset + i)
+                for i, review in enumerate(page)
+            ))
+            fragments[key] = minify_html(html) if self.minify_pages else html
+        return fragments[key]
+    
+    def _success_story_images(self):
+        """Map the success story image URLs to their sizes and placeholders.
+        
+        On the lite page an image with a small variant also gets the `src`
+        to load instead, with the size of that variant.
+        """
+        images = {}
+        for story in self.snapshot.success_stories:
+            url = story.get("image", "")
+            entry = dict(self.snapshot.images.get(url.replace("/static/", "public/", 1), {}))
+            if url.startswith("/static/assets/"):
+                file_name = url.removeprefix("/static/assets/")
+                path = self._image_path(file_name)
+                if path != f"public/assets/{file_name}":
+                    entry.update(self.snapshot.images.get(path, {}), src=self.image_url(file_name))
+            if entry:
+                images[url] = entry
+        return images
+    
+    def _create_reviews_section(self):
+        """Create the reviews section with client testimonials.
+        
+        Only the first page of slides is rendered inline; carousel.js fetches
+        the rest from /reviews/slides as the carousel advances.
+        """
+        reviews = self.load_reviews()
+        
+        # Get current language
+        current_lang = self.request.state.language
+        
+        # Generate the first page of review cards from the loaded data
+        review_cards = [
+            self._create_review_card(review, i)
+            for i, review in enumerate(reviews[:self.reviews_page_size])
+        ]
         
         return Section(
             Div(
@@ -865,7 +1589,10 @@ class TeambeeApp:
                             Div(
                                 *review_cards,
                                 id="slides",
-                                cls="slides flex transition-transform duration-300 ease-out relative cursor-grab active:cursor-grabbing animate-stagger-container"
+                                cls="slides flex transition-transform duration-300 ease-out relative cursor-grab active:cursor-grabbing animate-stagger-container",
+                                data_total=str(len(reviews)),
+                                data_page_size=str(self.reviews_page_size),
+                                data_fragment_url="/en/reviews/slides" if current_lang == "en" else "/reviews/slides"
                             ),
                             cls="wrapper overflow-hidden relative w-full touch-pan-x"
                         ),
@@ -889,6 +1616,29 @@ class TeambeeApp:
                         cls="text-center"
                     ),
                     
+                    # Search through the reviews and success stories; search.js
+                    # shows the results below the form as the visitor types
+                    Form(
+                        Input(
+                            type="search",
+                            name="q",
+                            placeholder=self.get_text("search", "placeholder"),
+                            aria_label=self.get_text("search", "label"),
+                            autocomplete="off",
+                            maxlength=str(self.search_query_length),
+                            cls="w-full rounded-lg border border-gray-300 bg-white px-4 py-3 text-base text-[#1B1947] focus:outline-none focus:ring-2 focus:ring-[#94C46F]"
+                        ),
+                        action="/en/search" if current_lang == "en" else "/search",
+                        method="get",
+                        role="search",
+                        cls="search-form max-w-xl mx-auto mt-8"
+                    ),
+                    Div(
+                        id="search-results",
+                        aria_live="polite",
+                        cls="max-w-2xl mx-auto mt-4"
+                    ),
+                    
                     # Success stories panel (initially hidden)
                     Div(
                         Div(
@@ -902,11 +1652,7 @@ class TeambeeApp:
                                     ),
                                     # Close button on the right
                                     Button(
-                                        Img(
-                                            src=self.versioned_url("/static/assets/close.svg"),
-                                            alt="Close",
-                                            cls="w-6 h-6"
-                                        ),
+                                        self.icon("close", "Close", cls="w-6 h-6"),
                                         cls="text-white hover:text-gray-200 transition-colors",
                                         id="close-success-stories"
                                     ),
@@ -918,6 +1664,15 @@ class TeambeeApp:
                             # Panel content
                             Div(
                                 Div(
+                                    # Links to the case study pages; success-stories.js
+                                    # replaces them with the full stories
+                                    Ul(
+                                        *[
+                                            Li(A(story.get("title", {}).get(current_lang, slug), href=self.case_url(slug), cls="text-white hover:underline"))
+                                            for slug, story in self.snapshot.cases.items()
+                                        ],
+                                        cls="space-y-2"
+                                    ),
                                     # Success stories container with vertical scrolling
                                     cls="space-y-8"
                                 ),
@@ -926,7 +1681,12 @@ class TeambeeApp:
                             ),
                             cls="bg-[#3D2E7C] h-screen w-full fixed top-16 right-0 transform translate-x-full transition-transform duration-500 ease-in-out z-[100] overflow-y-auto"
                         ),
-                        id="success-stories-panel"
+                        id="success-stories-panel",
+                        # Sizes, placeholders and lite variants of the story
+                        # images, which are added by success-stories.js
+                        data_images=json.dumps(self._success_story_images()),
+                        # Case study page of every story, in file order
+                        data_case_urls=json.dumps([self.case_url(slug) for slug in self.snapshot.cases])
                     ),
                     
                     cls="relative"
@@ -938,6 +1698,126 @@ class TeambeeApp:
             cls="py-8 md:py-16 bg-gray-100"
         )
     
+    def _create_search_results(self, query, results):
+        """Create the list of search results for a query."""
+        if not query.strip():
+            return ()
+        if not results:
+            return P(self.get_text("search", "no_results"), cls="text-center text-gray-500")
+        
+        items = []
+        for _, doc in results:
+            if doc["kind"] == "case":
+                item = A(
+                    Span(self.get_text("search", "case"), cls="text-xs font-semibold uppercase text-[#94C46F]"),
+                    Div(doc["title"], cls="font-semibold text-[#1B1947]"),
+                    Div(doc["subtitle"], cls="text-sm text-gray-500"),
+                    href=self.case_url(doc["slug"]),
+                    cls="block hover:underline"
+                )
+            else:
+                quote = doc["body"].strip('"')
+                if len(quote) > 160:
+                    quote = quote[:160].rsplit(" ", 1)[0] + "…"
+                item = Div(
+                    Span(self.get_text("search", "review"), cls="text-xs font-semibold uppercase text-[#94C46F]"),
+                    P(f'"{quote}"', cls="text-gray-600 italic"),
+                    Div(f"{doc['title']}, {doc['subtitle']}", cls="text-sm text-gray-500"),
+                )
+            items.append(Li(item, cls="bg-white p-4 rounded-lg shadow-sm border border-gray-100"))
+        return Ul(*items, cls="space-y-3")
+    
+    def _create_case_study(self, story):
+        """Create the main content of a case study page."""
+        current_lang = self.request.state.language
+        home = "/en" if current_lang == "en" else "/"
+        title = story.get("title", {}).get(current_lang, "")
+        image = story.get("image", "")
+        metrics = story.get("metrics", {})
+        
+        return Section(
+            Div(
+                A(
+                    self.get_text("cases", "back"),
+                    href=f"{home}#reviews",
+                    cls="inline-block text-white/80 hover:text-white hover:underline mb-8"
+                ),
+                
+                Div(
+                    # Image with the club's name
+                    Div(
+                        self.image(
+                            image.removeprefix("/static/assets/"),
+                            title,
+                            cls="w-full h-auto rounded-lg object-cover aspect-square shadow-lg mb-4",
+                            lazy=False
+                        ) if image.startswith("/static/assets/") else None,
+                        Div(
+                            H1(title, cls="text-white text-2xl md:text-3xl font-bold mb-2"),
+                            P(story.get("subtitle", {}).get(current_lang, ""), cls="text-white/80"),
+                            cls="bg-white/5 p-4 rounded-lg"
+                        ),
+                        cls="w-full md:w-1/3"
+                    ),
+                    
+                    # Strategy, results and conclusion
+                    Div(
+                        Div(
+                            H2(self.get_text("cases", "strategy"), cls="text-white text-2xl font-bold mb-4"),
+                            P(story.get("strategy", {}).get(current_lang, ""), cls="text-white/90 text-lg whitespace-pre-line"),
+                            cls="mb-8"
+                        ),
+                        Div(
+                            H2(self.get_text("cases", "results"), cls="text-white text-2xl font-bold mb-4"),
+                            Div(
+                                *[
+                                    self._create_case_metrics(phase, metrics[phase])
+                                    for phase in ("start", "three_months", "current")
+                                    if phase in metrics
+                                ],
+                                cls="space-y-6"
+                            ),
+                            cls="mb-8"
+                        ),
+                        Div(
+                            H2(self.get_text("cases", "conclusion"), cls="text-white text-2xl font-bold mb-4"),
+                            P(story.get("conclusion", {}).get(current_lang, ""), cls="text-white/90 text-lg whitespace-pre-line")
+                        ),
+                        cls="w-full md:w-2/3"
+                    ),
+                    cls="flex flex-col md:flex-row gap-8 items-start"
+                ),
+                
+                Div(
+                    A(
+                        self.get_text("services", "cta"),
+                        href=f"{home}#demo-request",
+                        cls="inline-flex h-12 items-center justify-center rounded-lg bg-[#94C46F] px-8 py-2 text-base font-medium text-white shadow transition-all duration-300 ease-in-out hover:bg-[#94C46F]/90 hover:scale-105 hover:shadow-lg focus-visible:outline-none focus-visible:ring-2 focus-visible:ring-[#94C46F] focus-visible:ring-offset-2"
+                    ),
+                    cls="text-center mt-12"
+                ),
+                
+                cls="container"
+            ),
+            id="case-study",
+            cls="bg-[#3D2E7C] pt-24 pb-16"
+        )
+    
+    def _create_case_metrics(self, phase, values):
+        """Create the metrics of one phase of a case study."""
+        return Div(
+            H3(self.get_text("cases", phase), cls="text-white font-semibold mb-2"),
+            Ul(
+                *[
+                    Li(f"{self.get_text('cases', name)} {values[name]}")
+                    for name in ("members", "app_users", "visitors")
+                    if name in values
+                ],
+                cls="list-disc list-inside text-white/80 space-y-1"
+            ),
+            cls="bg-white/5 p-4 rounded-lg"
+        )
+    
     def _create_login_section(self):
         """Create the login section."""
         login_form = LoginForm()
@@ -987,13 +1867,12 @@ class TeambeeApp:
                 cls="container relative z-10"
             ),
             
-            # Bottom honeycomb pattern
-            Div(
-                Img(
-                    src=self.versioned_url("/static/assets/honeycomb-cropped.svg"),
-                    alt="Honeycomb Pattern",
-                    cls="w-[200%] h-[40vh] object-cover opacity-15 dark:opacity-10 pointer-events-none [transform:scaleY(-1)]",
-                    loading="lazy"
+            # Bottom honeycomb pattern, left out of the lite page
+            None if self.lite else Div(
+                self.image(
+                    "honeycomb-cropped.svg",
+                    "Honeycomb Pattern",
+                    cls="w-[200%] h-[40vh] object-cover opacity-15 dark:opacity-10 pointer-events-none [transform:scaleY(-1)]"
                 ),
                 cls="absolute bottom-0 left-0 right-0 w-full h-[40vh] z-0"
             ),
@@ -1002,6 +1881,66 @@ class TeambeeApp:
             cls="pt-8 md:pt-12 pb-16 bg-white/90 backdrop-blur-sm relative"
         )
     
+    def _create_contact_section(self):
+        """Create the contact and demo request section."""
+        contact_form = ContactForm(
+            lambda key: self.get_text("contact", key),
+            action="/en/contact" if self.request.state.language == "en" else "/contact"
+        )
+        
+        return Section(
+            Div(
+                Div(
+                    Div(
+                        H2(
+                            self.get_text("contact", "title"),
+                            id="demo-request-heading",
+                            cls="text-3xl font-bold italic text-[#3D2E7C] mb-2"
+                        ),
+                        P(
+                            self.get_text("contact", "subtitle"),
+                            cls="text-gray-600"
+                        ),
+                        cls="text-center mb-8"
+                    ),
+                    
+                    contact_form.render(),
+                    
+                    cls="max-w-2xl mx-auto"
+                ),
+                cls="container relative z-10"
+            ),
+            id="demo-request",
+            cls="py-16 bg-[#F8F7FB] relative"
+        )
+    
+    def contact_result_page(self, message, status_code=200, headers=None):
+        """Answer a contact form that was submitted without JavaScript."""
+        home = "/en" if self.request.state.language == "en" else "/"
+        return HTMLResponse(
+            to_xml(Html(
+                Head(
+                    Title("Teambee"),
+                    Meta(name="viewport", content="width=device-width, initial-scale=1.0"),
+                    Meta(name="robots", content="noindex"),
+                    Link(rel="stylesheet", href=self.versioned_url("/static/app.css"), type="text/css")
+                ),
+                Body(
+                    Main(
+                        P(message, cls="text-lg text-gray-700 mb-6"),
+                        A(
+                            self.get_text("contact", "back"),
+                            href=f"{home}#demo-request",
+                            cls="text-[#3D2E7C] hover:underline"
+                        ),
+                        cls="container max-w-2xl mx-auto py-16 text-center"
+                    )
+                )
+            )),
+            status_code=status_code,
+            headers=headers
+        )
+    
     def _create_footer(self):
         """Create the footer section."""
         return Footer(
@@ -1009,11 +1948,7 @@ class TeambeeApp:
                 Div(
                     Div(
                         Div(
-                            Img(
-                                src=self.versioned_url("/static/assets/Teambee logo wit.png"),
-                                alt="Teambee Logo",
-                                cls="h-8 w-auto"
-                            ),
+                            self.image("Teambee logo wit.png", "Teambee Logo", cls="h-8 w-auto"),
                             cls="mb-4"
                         ),
                         P(
@@ -1075,11 +2010,7 @@ class TeambeeApp:
                     Div(
                         Div(
                             A(
-                                Img(
-                                    src=self.versioned_url("/static/assets/instagram-167-svgrepo-com.svg"),
-                                    alt="Instagram",
-                                    cls="w-6 h-6"
-                                ),
+                                self.icon("instagram-167-svgrepo-com", "Instagram", cls="w-6 h-6"),
                                 href="https://www.instagram.com/keboemmastersinretention/",
                                 target="_blank",
                                 rel="noopener noreferrer",
@@ -1090,11 +2021,7 @@ class TeambeeApp:
                         ),
                         Div(
                             A(
-                                Img(
-                                    src=self.versioned_url("/static/assets/linkedin-svgrepo-com.svg"),
-                                    alt="LinkedIn",
-                                    cls="w-6 h-6"
-                                ),
+                                self.icon("linkedin-svgrepo-com", "LinkedIn", cls="w-6 h-6"),
                                 href="https://linkedin.com/company/keboem",
                                 target="_blank",
                                 rel="noopener noreferrer",
@@ -1105,11 +2032,7 @@ class TeambeeApp:
                         ),
                         Div(
                             A(
-                                Img(
-                                    src=self.versioned_url("/static/assets/facebook-svgrepo-com.svg"),
-                                    alt="Facebook",
-                                    cls="w-6 h-6"
-                                ),
+                                self.icon("facebook-svgrepo-com", "Facebook", cls="w-6 h-6"),
                                 href="https://www.facebook.com/keboem",
                                 target="_blank",
                                 rel="noopener noreferrer",
@@ -1143,5 +2066,12 @@ teambee = TeambeeApp()
 app = teambee.get_app()
 
 if __name__ == "__main__":
-    # Start the FastHTML server
-    serve(host="0.0.0.0", port=int(os.environ.get("PORT", 8000)))
+    # Start the FastHTML server. It runs behind Railway's proxy, whose
+    # addresses aren't fixed, so the client address is taken from
+    # X-Forwarded-For unless FORWARDED_ALLOW_IPS names the proxies
+    serve(
+        host="0.0.0.0",
+        port=int(os.environ.get("PORT", 8000)),
+        access_log=False,
+        forwarded_allow_ips=os.environ.get("FORWARDED_ALLOW_IPS", "*")
+    )
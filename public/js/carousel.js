@@ -23,7 +23,14 @@ document.addEventListener('DOMContentLoaded', function() {
     autoplayDelay: 5000,
     threshold: 50,
     isTransitioning: false,
-    transitionDuration: 300
+    transitionDuration: 300,
+    // Reviews are rendered a page at a time; the rest is fetched on demand
+    totalSlides: parseInt(slides.dataset.total || '0', 10),
+    fragmentUrl: slides.dataset.fragmentUrl || '',
+    isLoading: false,
+    // Autoplay only runs while the carousel is on screen and the tab is visible
+    isOnScreen: true,
+    isHovered: false
   };
   
   // Initialize carousel
@@ -63,6 +70,46 @@ document.addEventListener('DOMContentLoaded', function() {
     startAutoplay();
   }
   
+  // Check whether more slides are available on the server
+  function hasMoreSlides() {
+    return config.fragmentUrl && config.slideCount < config.totalSlides;
+  }
+  
+  // Fetch the next page of slides and splice it in before the trailing clone
+  function loadMoreSlides() {
+    if (config.isLoading || !hasMoreSlides()) return;
+    config.isLoading = true;
+    
+    fetch(`${config.fragmentUrl}?offset=${config.slideCount}`)
+      .then(response => response.text())
+      .then(html => {
+        const template = document.createElement('template');
+        template.innerHTML = html.trim();
+        const newSlides = template.content.querySelectorAll('.slide');
+        if (newSlides.length === 0) {
+          // Nothing left on the server, stop asking
+          config.totalSlides = config.slideCount;
+          return;
+        }
+        
+        const trailingClone = slides.lastElementChild;
+        newSlides.forEach(slide => slides.insertBefore(slide, trailingClone));
+        config.slideCount += newSlides.length;
+        
+        // The leading clone mirrors the last real slide, so refresh it
+        const slideItems = slides.getElementsByClassName('slide');
+        const lastSlide = slideItems[config.slideCount].cloneNode(true);
+        slides.replaceChild(lastSlide, slides.firstElementChild);
+        
+        createDots();
+        updateActiveDot(config.currentIndex - 1);
+      })
+      .catch(error => console.error('Error loading reviews:', error))
+      .finally(() => {
+        config.isLoading = false;
+      });
+  }
+  
   // Create navigation dots
   function createDots() {
     if (!dotsContainer) return;
@@ -111,30 +158,69 @@ document.addEventListener('DOMContentLoaded', function() {
       }
     }
     
-    // Handle window resize
+    // Handle window resize, measuring at most once per frame
     window.addEventListener('resize', function() {
-      const slideItems = slides.getElementsByClassName('slide');
-      if (slideItems.length > 0) {
-        config.slideWidth = slideItems[0].offsetWidth;
-        setPositionByIndex(config.currentIndex, false);
-      }
-    });
+      window.TeambeeFrame.schedule(handleResize);
+    }, { passive: true });
     
     // Pause autoplay on hover or touch
-    slider.addEventListener('mouseenter', stopAutoplay);
-    slider.addEventListener('touchstart', stopAutoplay);
+    slider.addEventListener('mouseenter', function() {
+      config.isHovered = true;
+      stopAutoplay();
+    });
+    slider.addEventListener('touchstart', stopAutoplay, { passive: true });
     
     // Resume autoplay when mouse leaves
-    slider.addEventListener('mouseleave', startAutoplay);
+    slider.addEventListener('mouseleave', function() {
+      config.isHovered = false;
+      startAutoplay();
+    });
+    
+    // Pause autoplay while the reviews are scrolled out of view
+    if ('IntersectionObserver' in window) {
+      const observer = new IntersectionObserver(function(entries) {
+        config.isOnScreen = entries[entries.length - 1].isIntersecting;
+        if (config.isOnScreen) {
+          startAutoplay();
+        } else {
+          stopAutoplay();
+        }
+      });
+      observer.observe(slider);
+    }
+    
+    // Pause autoplay and any drag animation while the tab is hidden
+    document.addEventListener('visibilitychange', function() {
+      if (document.hidden) {
+        stopAutoplay();
+        if (config.isDragging) touchEnd();
+      } else {
+        startAutoplay();
+      }
+    });
     
     // Handle transition end
     slides.addEventListener('transitionend', handleTransitionEnd);
   }
   
+  // Re-measure the slides after a resize
+  function handleResize() {
+    const slideItems = slides.getElementsByClassName('slide');
+    if (slideItems.length > 0) {
+      config.slideWidth = slideItems[0].offsetWidth;
+      setPositionByIndex(config.currentIndex, false);
+    }
+  }
+  
   // Handle transition end
   function handleTransitionEnd() {
     config.isTransitioning = false;
     
+    // Prefetch the next page when nearing the end of the loaded slides
+    if (config.currentIndex >= config.slideCount - 1) {
+      loadMoreSlides();
+    }
+    
     // Check if we need to jump to the other end
     if (config.currentIndex === 0) {
       // Jump to the last real slide without animation
@@ -180,6 +266,7 @@ document.addEventListener('DOMContentLoaded', function() {
   
   // Touch end event
   function touchEnd() {
+    if (!config.isDragging) return;
     config.isDragging = false;
     cancelAnimationFrame(config.animationID);
     
@@ -263,9 +350,15 @@ document.addEventListener('DOMContentLoaded', function() {
     return event.type.includes('mouse') ? event.pageX : event.touches[0].clientX;
   }
   
+  // Check whether autoplay should be running
+  function canAutoplay() {
+    return config.isOnScreen && !config.isHovered && !document.hidden;
+  }
+  
   // Start autoplay
   function startAutoplay() {
-    if (config.autoplayInterval) clearInterval(config.autoplayInterval);
+    stopAutoplay();
+    if (!canAutoplay()) return;
     
     config.autoplayInterval = setInterval(() => {
       if (!config.isDragging && !config.isTransitioning) {
@@ -278,6 +371,7 @@ document.addEventListener('DOMContentLoaded', function() {
   // Stop autoplay
   function stopAutoplay() {
     if (config.autoplayInterval) clearInterval(config.autoplayInterval);
+    config.autoplayInterval = null;
   }
   
   // Initialize the carousel
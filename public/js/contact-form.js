@@ -0,0 +1,38 @@
+// Submits the contact form in the background and shows the result in place
+document.addEventListener('DOMContentLoaded', function() {
+    document.querySelectorAll('form.contact-form').forEach(form => {
+        const status = form.querySelector('.contact-status');
+        const button = form.querySelector('button[type="submit"]');
+
+        form.addEventListener('submit', async function(e) {
+            e.preventDefault();
+            button.disabled = true;
+            form.querySelectorAll('[aria-invalid]').forEach(field => field.removeAttribute('aria-invalid'));
+
+            let message = status.dataset.error;
+            try {
+                const response = await fetch(form.action, {
+                    method: 'POST',
+                    body: new FormData(form),
+                    headers: { 'Accept': 'application/json' }
+                });
+                if (response.ok) {
+                    message = status.dataset.sent;
+                    form.reset();
+                } else if (response.status === 400) {
+                    const result = await response.json();
+                    Object.keys(result.errors || {}).forEach(name => {
+                        const field = form.elements[name];
+                        if (field) field.setAttribute('aria-invalid', 'true');
+                    });
+                    message = status.dataset.invalid;
+                }
+            } catch (error) {
+                // Network error; keep the generic message
+            }
+
+            status.textContent = message;
+            button.disabled = false;
+        });
+    });
+});
@@ -0,0 +1,32 @@
+// Shared requestAnimationFrame scheduler
+// Scroll and resize handlers queue their work here, so each task runs at
+// most once per frame no matter how many events fire in between.
+window.TeambeeFrame = (function() {
+  const tasks = new Set();
+  let scheduled = false;
+
+  // Run all tasks queued since the last frame
+  function flush() {
+    scheduled = false;
+    const queued = Array.from(tasks);
+    tasks.clear();
+    queued.forEach(task => {
+      try {
+        task();
+      } catch (error) {
+        console.error('Error in frame task:', error);
+      }
+    });
+  }
+
+  // Queue a task for the next frame; queuing it again before then is a no-op
+  function schedule(task) {
+    tasks.add(task);
+    if (!scheduled) {
+      scheduled = true;
+      requestAnimationFrame(flush);
+    }
+  }
+
+  return { schedule };
+})();
@@ -3,6 +3,36 @@ document.addEventListener('DOMContentLoaded', function() {
     const menu = document.getElementById('language-dropdown-menu');
     
     if (button && menu) {
+        // Load the other language in the background as soon as the visitor
+        // shows interest in switching, so the switch itself is instant
+        const alternateUrl = button.dataset.alternateUrl;
+        let speculated = false;
+        
+        function speculate() {
+            if (speculated || !alternateUrl || (navigator.connection && navigator.connection.saveData)) return;
+            speculated = true;
+            
+            if (HTMLScriptElement.supports && HTMLScriptElement.supports('speculationrules')) {
+                const rules = document.createElement('script');
+                rules.type = 'speculationrules';
+                rules.textContent = JSON.stringify({
+                    prerender: [{ source: 'list', urls: [alternateUrl] }],
+                    // Used where prerendering isn't allowed, e.g. to save memory
+                    prefetch: [{ source: 'list', urls: [alternateUrl] }]
+                });
+                document.head.appendChild(rules);
+            } else {
+                const link = document.createElement('link');
+                link.rel = 'prefetch';
+                link.href = alternateUrl;
+                document.head.appendChild(link);
+            }
+        }
+        
+        ['pointerenter', 'focus', 'touchstart'].forEach(type => {
+            button.addEventListener(type, speculate, { passive: true });
+        });
+        
         // Toggle dropdown when button is clicked
         button.addEventListener('click', function(event) {
             event.stopPropagation(); // Stop event from bubbling up
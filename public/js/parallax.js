@@ -1,31 +1,12 @@
 // Handles the honeycomb parallax scrolling effect
 
-// Throttle function to limit how often the scroll handler fires
-function throttle(callback, delay = 15) {
-  let isThrottled = false;
-  
-  return function() {
-    if (isThrottled) return;
-    
-    isThrottled = true;
-    const context = this;
-    const args = arguments;
-    
-    callback.apply(context, args);
-    
-    setTimeout(() => {
-      isThrottled = false;
-    }, delay);
-  };
-}
+let honeycomb = null;
 
 // Parallax effect function
 function updateParallax() {
   try {
-    const scrolled = window.pageYOffset;
-    const honeycomb = document.querySelector('.parallax');
-    
     if (honeycomb) {
+      const scrolled = window.pageYOffset;
       honeycomb.style.transform = `translate3d(0, ${-scrolled * 0.4}px, 0)`;
     }
   } catch (error) {
@@ -33,19 +14,24 @@ function updateParallax() {
   }
 }
 
-// Apply throttling to the scroll event handler
-const throttledParallax = throttle(updateParallax);
+// Coalesce scroll and resize events into one transform write per frame
+function scheduleParallax() {
+  window.TeambeeFrame.schedule(updateParallax);
+}
 
 // Initialize parallax effect
 function initParallax() {
+  honeycomb = document.querySelector('.parallax');
+  if (!honeycomb) return;
+
   // Run once on page load
   updateParallax();
-  
-  // Add scroll event listener with throttled function
-  window.addEventListener('scroll', throttledParallax, { passive: true });
-  
+
+  // Add scroll event listener
+  window.addEventListener('scroll', scheduleParallax, { passive: true });
+
   // Handle resize events
-  window.addEventListener('resize', throttledParallax, { passive: true });
+  window.addEventListener('resize', scheduleParallax, { passive: true });
 }
 
 // Run initialization when DOM is fully loaded
@@ -53,4 +39,4 @@ if (document.readyState === 'loading') {
   document.addEventListener('DOMContentLoaded', initParallax);
 } else {
   initParallax();
-}
\ No newline at end of file
+}
@@ -1,90 +1,89 @@
 // Scroll Animation Script for Teambee
-document.addEventListener('DOMContentLoaded', function() {
-    console.log('Scroll animations script loaded successfully!');
-    
+// Elements are revealed once by an IntersectionObserver when they enter the
+// viewport, so scrolling itself never triggers layout reads.
+(function() {
     // Elements to animate
     const animatedElements = [
         // Section titles and subtitles
         '.animate-section-title',
         '.animate-section-subtitle',
-        
+
         // Cards and features
         '.animate-card',
-        
+
         // Lists and other elements
         '.animate-list-item',
-        
+
         // Use specific animation groups for staggered animations
         '.animate-stagger-container .animate-stagger-item'
     ];
-    
+
     // Combined selector for all animated elements
     const selector = animatedElements.join(', ');
-    
-    // Get all elements to animate
-    const elements = document.querySelectorAll(selector);
-    console.log(`Found ${elements.length} elements to animate`);
-    
-    // Set initial styles (hidden)
-    elements.forEach(function(element) {
-        // Don't apply to stagger items - they'll be handled by their container
-        if (!element.classList.contains('animate-stagger-item')) {
-            element.style.opacity = '0';
-            element.style.transform = 'translateY(20px)';
-            element.style.transition = 'opacity 0.3s ease, transform 0.3s ease';
+
+    // Reveal an element, applying its stagger delay if it has one
+    function reveal(element) {
+        const delay = element.dataset.staggerDelay;
+        if (delay) {
+            element.style.transitionDelay = `${delay}s`;
+            // Drop the delay afterwards so later transitions aren't held back
+            element.addEventListener('transitionend', function() {
+                element.style.transitionDelay = '';
+            }, { once: true });
         }
-    });
-    
-    // Handle staggered containers separately
-    const staggerContainers = document.querySelectorAll('.animate-stagger-container');
-    console.log(`Found ${staggerContainers.length} stagger containers`);
-    
-    staggerContainers.forEach(function(container) {
-        const items = container.querySelectorAll('.animate-stagger-item');
-        console.log(`Found ${items.length} stagger items in container`);
-        
-        items.forEach(function(item, index) {
-            item.style.opacity = '0';
-            item.style.transform = 'translateY(20px)';
-            item.style.transition = 'opacity 0.3s ease, transform 0.3s ease';
-            // Add delay based on index for staggered effect
-            item.dataset.staggerDelay = index * 0.05; // 50ms between items
-        });
-    });
-    
-    // Check if element is in viewport
-    function isInViewport(element) {
-        const rect = element.getBoundingClientRect();
-        return (
-            rect.top <= (window.innerHeight || document.documentElement.clientHeight) * 0.95 &&
-            rect.bottom >= 0
-        );
+        element.style.opacity = '1';
+        element.style.transform = 'translateY(0)';
     }
-    
-    // Animate elements when they enter viewport
-    function animateOnScroll() {
-        elements.forEach(function(element) {
-            if (isInViewport(element)) {
-                if (element.classList.contains('animate-stagger-item')) {
-                    // Apply staggered delay
-                    const delay = element.dataset.staggerDelay || 0;
-                    setTimeout(function() {
-                        element.style.opacity = '1';
-                        element.style.transform = 'translateY(0)';
-                    }, delay * 1000);
-                } else {
-                    element.style.opacity = '1';
-                    element.style.transform = 'translateY(0)';
+
+    // Hide an element until it is revealed
+    function prepare(element) {
+        element.style.opacity = '0';
+        element.style.transform = 'translateY(20px)';
+        element.style.transition = 'opacity 0.3s ease, transform 0.3s ease';
+    }
+
+    function initScrollAnimations() {
+        const elements = document.querySelectorAll(selector);
+
+        // Respect the user's motion preference and old browsers: show everything as-is
+        const reduceMotion = window.matchMedia &&
+            window.matchMedia('(prefers-reduced-motion: reduce)').matches;
+        if (reduceMotion || !('IntersectionObserver' in window)) {
+            return;
+        }
+
+        // Set initial styles (hidden)
+        elements.forEach(prepare);
+
+        // Stagger items get a delay based on their position in the container
+        document.querySelectorAll('.animate-stagger-container').forEach(function(container) {
+            container.querySelectorAll('.animate-stagger-item').forEach(function(item, index) {
+                item.dataset.staggerDelay = index * 0.05; // 50ms between items
+            });
+        });
+
+        // Reveal elements once they are within 95% of the viewport height
+        const observer = new IntersectionObserver(function(entries) {
+            entries.forEach(function(entry) {
+                if (entry.isIntersecting) {
+                    reveal(entry.target);
+                    observer.unobserve(entry.target);
                 }
-            }
+            });
+        }, {
+            rootMargin: '0px 0px -5% 0px',
+            threshold: 0
+        });
+
+        elements.forEach(function(element) {
+            observer.observe(element);
         });
     }
-    
-    // Run on initial load
-    animateOnScroll();
-    console.log('Initial animations applied');
-    
-    // Add scroll listener
-    window.addEventListener('scroll', animateOnScroll);
-    console.log('Scroll listener added');
-}); 
\ No newline at end of file
+
+    // Run initialization when DOM is fully loaded
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', initScrollAnimations);
+    } else {
+        initScrollAnimations();
+    }
+})();
@@ -0,0 +1,42 @@
+// Searches the reviews and success stories as the visitor types
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.querySelector('form.search-form');
+    const results = document.getElementById('search-results');
+    if (!form || !results) return;
+
+    const input = form.elements.q;
+    let timer = null;
+    let controller = null;
+
+    async function search() {
+        const query = input.value.trim();
+        if (controller) controller.abort();
+        if (!query) {
+            results.innerHTML = '';
+            return;
+        }
+
+        controller = new AbortController();
+        try {
+            const response = await fetch(`${form.action}?q=${encodeURIComponent(query)}`, {
+                signal: controller.signal
+            });
+            if (response.ok) {
+                results.innerHTML = await response.text();
+            }
+        } catch (error) {
+            // Aborted by a newer query or a network error; keep the last results
+        }
+    }
+
+    input.addEventListener('input', function() {
+        clearTimeout(timer);
+        timer = setTimeout(search, 150);
+    });
+
+    form.addEventListener('submit', function(e) {
+        e.preventDefault();
+        clearTimeout(timer);
+        search();
+    });
+});
@@ -37,6 +37,25 @@ document.addEventListener('DOMContentLoaded', function() {
             return path.startsWith('/en') ? 'en' : 'nl';
         }
 
+        // Intrinsic image sizes and placeholders rendered by the server, so
+        // the images don't shift the layout and show something while they
+        // load; on the lite page also the URL of a smaller variant to load
+        const imageSizes = JSON.parse(storiesPanel.dataset.images || '{}');
+
+        function imageAttributes(src) {
+            const size = imageSizes[src];
+            if (!size) {
+                return `src="${src}" loading="lazy" decoding="async"`;
+            }
+            const placeholder = size.placeholder
+                ? ` style="background:${size.color} url(${size.placeholder}) center/cover no-repeat"`
+                : '';
+            return `src="${size.src || src}" width="${size.width}" height="${size.height}"${placeholder} loading="lazy" decoding="async"`;
+        }
+
+        // Case study page of every story, in file order
+        const caseUrls = JSON.parse(storiesPanel.dataset.caseUrls || '[]');
+
         // Get version from script tag
         const scriptTag = document.querySelector('script[src*="success-stories.js"]');
         const version = scriptTag ? scriptTag.src.split('v=')[1] : '';
@@ -73,7 +92,7 @@ document.addEventListener('DOMContentLoaded', function() {
                             <div class="flex flex-col md:flex-row gap-8 items-start">
                                 ${isImageLeft ? `
                                     <div class="w-full md:w-1/3 order-first">
-                                        <img src="${story.image}" alt="${story.title[currentLang]}" class="w-full h-auto rounded-lg object-cover aspect-square shadow-lg mb-4">
+                                        <img ${imageAttributes(story.image)} alt="${story.title[currentLang]}" class="w-full h-auto rounded-lg object-cover aspect-square shadow-lg mb-4">
                                         <div class="bg-white/5 p-4 rounded-lg">
                                             <h4 class="text-white text-xl font-bold mb-2">${story.title[currentLang]}</h4>
                                             <p class="text-white/80">${story.subtitle[currentLang]}</p>
@@ -120,11 +139,12 @@ document.addEventListener('DOMContentLoaded', function() {
                                         <div>
                                             <h3 class="text-white text-2xl font-bold mb-4">${currentLang === 'nl' ? 'Conclusie' : 'Conclusion'}</h3>
                                             <p class="text-white/90 text-lg whitespace-pre-line">${story.conclusion[currentLang]}</p>
+                                            ${caseUrls[index] ? `<a href="${caseUrls[index]}" class="inline-block mt-4 text-[#94C46F] font-semibold hover:underline">${currentLang === 'nl' ? 'Lees de volledige case' : 'Read the full case'}</a>` : ''}
                                         </div>
                                     </div>
                                 ` : `
                                     <div class="w-full md:w-1/3 order-first md:order-last">
-                                        <img src="${story.image}" alt="${story.title[currentLang]}" class="w-full h-auto rounded-lg object-cover aspect-square shadow-lg mb-4">
+                                        <img ${imageAttributes(story.image)} alt="${story.title[currentLang]}" class="w-full h-auto rounded-lg object-cover aspect-square shadow-lg mb-4">
                                         <div class="bg-white/5 p-4 rounded-lg">
                                             <h4 class="text-white text-xl font-bold mb-2">${story.title[currentLang]}</h4>
                                             <p class="text-white/80">${story.subtitle[currentLang]}</p>
@@ -171,6 +191,7 @@ document.addEventListener('DOMContentLoaded', function() {
                                         <div>
                                             <h3 class="text-white text-2xl font-bold mb-4">${currentLang === 'nl' ? 'Conclusie' : 'Conclusion'}</h3>
                                             <p class="text-white/90 text-lg whitespace-pre-line">${story.conclusion[currentLang]}</p>
+                                            ${caseUrls[index] ? `<a href="${caseUrls[index]}" class="inline-block mt-4 text-[#94C46F] font-semibold hover:underline">${currentLang === 'nl' ? 'Lees de volledige case' : 'Read the full case'}</a>` : ''}
                                         </div>
                                     </div>
                                 `}
@@ -0,0 +1,74 @@
+"""Harness shared by the burst benchmarks in this directory.
+
+Requests are sent to the ASGI app in-process, so no server is needed, and
+every request comes from its own client address, so rate limits don't kick
+in.
+"""
+import asyncio
+import statistics
+import time
+
+addresses = (f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}" for i in range(1, 2 ** 24))
+
+
+async def call(app, path, method="GET", body=b"", headers=()):
+    """Send one request to `app` and return its status code."""
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "server": ("localhost", 80),
+        "client": (next(addresses), 12345),
+        "root_path": "",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [(b"host", b"localhost"), *headers],
+    }
+    received = False
+    status = None
+
+    async def receive():
+        nonlocal received
+        if received:
+            # Nothing more to send; wait like a client that keeps the connection open
+            await asyncio.Event().wait()
+        received = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def latencies(request, count, expected=200):
+    """Await `request()` `count` times, one after the other.
+
+    Returns the latencies in ms and the number of requests that didn't get
+    the `expected` status (e.g. because they were shed).
+    """
+    result = []
+    failed = 0
+    for _ in range(count):
+        start = time.perf_counter()
+        status = await request()
+        result.append((time.perf_counter() - start) * 1000)
+        failed += status != expected
+    return result, failed
+
+
+def report(name, result):
+    """Print a summary of a `latencies` result; returns its p95, max and failures."""
+    result, failed = result
+    result = sorted(result)
+    p95 = result[int(len(result) * 0.95) - 1]
+    print(
+        f"{name:28} p50 {statistics.median(result):7.2f} ms   p95 {p95:7.2f} ms   "
+        f"max {result[-1]:7.2f} ms   failed {failed}"
+    )
+    return p95, result[-1], failed
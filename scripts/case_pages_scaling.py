@@ -0,0 +1,108 @@
+"""Synthetic scaling check for the case study pages.
+
+Generates success story sets of increasing size and, for each, times
+rendering every case study body from scratch and then the incremental
+re-render after one story changes, which should only render that story
+again. Also checks that assembling a single case page stays flat as the
+number of stories grows. Run from anywhere with
+``python scripts/case_pages_scaling.py``.
+"""
+import copy
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+os.environ["AUTH_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "auth.db")
+os.environ["LEADS_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "leads.db")
+
+from main import teambee
+
+SIZES = [4, 100, 500]
+ROUNDS = 50
+# Allowed growth of a single page render between the smallest and largest set
+MAX_PAGE_TIME_RATIO = 1.5
+
+
+def make_stories(count):
+    """Generate `count` synthetic success stories based on the real ones."""
+    with open(os.path.join(ROOT, "public", "data", "success_stories.json"), encoding="utf-8") as f:
+        templates = json.load(f)
+    stories = []
+    for i in range(count):
+        story = copy.deepcopy(templates[i % len(templates)])
+        story["title"] = {"nl": f"Club {i}", "en": f"Club {i}"}
+        stories.append(story)
+    return stories
+
+
+def load(path, stories):
+    """Write the stories to `path` and load them into a new snapshot."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(stories, f)
+    return teambee.content.reload()
+
+
+def page_time(snapshot, slug):
+    """Median seconds to assemble a case page around its cached body."""
+    timings = []
+    for _ in range(ROUNDS):
+        request = teambee._synthetic_request(f"/cases/{slug}", "nl", snapshot)
+        start = time.perf_counter()
+        teambee.render_case_page(request, slug)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def main():
+    results = []
+    failed = False
+    original = teambee.content.data_files["success_stories"]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "success_stories.json")
+        teambee.content.data_files["success_stories"] = path
+        for count in SIZES:
+            stories = make_stories(count)
+            teambee.case_bodies.clear()
+            snapshot = load(path, stories)
+            start = time.perf_counter()
+            teambee.prerender_cases(snapshot)
+            full = time.perf_counter() - start
+
+            # Change the English text of one story; only that body should be rendered again
+            stories[count // 2]["conclusion"]["en"] += " Updated."
+            before = set(teambee.case_bodies)
+            snapshot = load(path, stories)
+            start = time.perf_counter()
+            teambee.prerender_cases(snapshot)
+            incremental = time.perf_counter() - start
+            rendered = len(set(teambee.case_bodies) - before)
+
+            page = page_time(snapshot, next(iter(snapshot.cases)))
+            results.append(page)
+            print(
+                f"{count:>5} stories  all {full * 1000:8.1f} ms  after one change {incremental * 1000:7.1f} ms "
+                f"({rendered} rendered)  one page {page * 1000:6.2f} ms"
+            )
+            if rendered != 1 or len(teambee.case_bodies) != 2 * count:
+                failed = True
+
+    teambee.content.data_files["success_stories"] = original
+    teambee.content.reload()
+    ratio = results[-1] / results[0]
+    print(f"page time ratio {ratio:.3f}")
+    if failed or ratio > MAX_PAGE_TIME_RATIO:
+        print("FAIL: case study pages are not regenerated incrementally")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
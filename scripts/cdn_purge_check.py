@@ -0,0 +1,183 @@
+"""Check the CDN surrogate keys and the purges sent when content changes.
+
+First requests pages, a review fragment and static files from the ASGI app
+in-process and checks their Surrogate-Key headers. Then edits a copy of the
+content in a temporary directory and checks which keys the purger sends to a
+local purge stub after each reload: ``python scripts/cdn_purge_check.py``.
+"""
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+os.environ["AUTH_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "auth.db")
+os.environ["LEADS_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "leads.db")
+
+from main import app, teambee
+from cdn import CDNPurger
+from content_store import ContentStore
+
+# Path and the keys its response must be tagged with
+TAGGED = [
+    ("/", ["page", "page:nl", "translations:nl", "data:reviews", "data:success_stories"]),
+    ("/en", ["page", "page:en", "translations:en", "data:reviews"]),
+    ("/en/reviews/slides", ["page:en", "translations:en", "data:reviews"]),
+    ("/static/data/reviews.json", ["static", "static:data/reviews.json", "data:reviews"]),
+    ("/static/js/carousel.js", ["static", "static:js/carousel.js"]),
+]
+
+
+class PurgeStub:
+    """Local stand-in for a CDN purge endpoint.
+
+    Serves on 127.0.0.1 in a background thread and records the keys of
+    every purge request in `purges`.
+    """
+
+    def __init__(self, port=0):
+        """Start the stub; `port` 0 picks a free port."""
+        self.purges = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                stub.purges.append(json.loads(body or b"{}").get("keys", []))
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/purge"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Stop the stub."""
+        self.server.shutdown()
+        self.server.server_close()
+
+
+async def surrogate_keys(path):
+    """Request a path and return the keys of its Surrogate-Key header."""
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "server": ("localhost", 80),
+        "client": ("127.0.0.1", 12345),
+        "root_path": "",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [(b"host", b"localhost")],
+    }
+    headers = {}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            headers.update((name.decode(), value.decode()) for name, value in message["headers"])
+
+    await app(scope, receive, send)
+    return headers.get("surrogate-key", "").split()
+
+
+def touch(path, text=None):
+    """Rewrite a file (optionally with new text) with a later modification time."""
+    if text is not None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5 * 10 ** 9))
+
+
+async def check_purges(stub):
+    """Edit a copy of the content and return the failed checks."""
+    base_dir = tempfile.mkdtemp()
+    shutil.copytree(os.path.join(ROOT, "translations"), os.path.join(base_dir, "translations"))
+    shutil.copytree(os.path.join(ROOT, "public", "data"), os.path.join(base_dir, "public", "data"))
+    shutil.copytree(os.path.join(ROOT, "public", "js"), os.path.join(base_dir, "public", "js"))
+    os.makedirs(os.path.join(base_dir, "public", "assets"))
+    shutil.copy(os.path.join(ROOT, "public", "assets", "manifest.json"), os.path.join(base_dir, "public", "assets"))
+
+    store = ContentStore(base_dir)
+    purger = CDNPurger(stub.url, store.snapshot)
+    store.after_reload.append(purger.after_reload)
+
+    en_path = os.path.join(base_dir, "translations", "en.json")
+    with open(en_path, encoding="utf-8") as f:
+        en_text = f.read()
+    reviews_path = os.path.join(base_dir, "public", "data", "reviews.json")
+    with open(reviews_path, encoding="utf-8") as f:
+        reviews_text = f.read()
+
+    # Change, keys that must be purged, keys that must not be
+    changes = [
+        ("edit en.json", lambda: touch(en_path, en_text.replace("Teambee", "Teambee!", 1)),
+         {"translations:en"}, {"translations:nl", "page", "data:reviews"}),
+        ("edit reviews.json", lambda: touch(reviews_path, reviews_text.replace("}", ' , "edited": true}', 1)),
+         {"data:reviews", "static:data/reviews.json", "page"}, {"translations:en", "translations:nl"}),
+        ("touch carousel.js", lambda: touch(os.path.join(base_dir, "public", "js", "carousel.js")),
+         {"static:js/carousel.js", "page"}, {"data:reviews", "translations:en"}),
+    ]
+    failures = []
+    for name, change, expected, unexpected in changes:
+        stub.purges.clear()
+        change()
+        await store.refresh()
+        purged = {key for keys in stub.purges for key in keys}
+        ok = expected <= purged and not unexpected & purged
+        print(f"{name:22} purged {sorted(purged)}  {'OK' if ok else 'MISMATCH'}")
+        if not ok:
+            failures.append(name)
+
+    stub.purges.clear()
+    await store.refresh()
+    if stub.purges:
+        failures.append("unchanged content was purged")
+    shutil.rmtree(base_dir)
+    return failures
+
+
+async def main():
+    await teambee.prerender(teambee.content.snapshot)
+    failures = []
+    for path, expected in TAGGED:
+        keys = await surrogate_keys(path)
+        ok = set(expected) <= set(keys)
+        print(f"{path:28} {' '.join(keys)}  {'OK' if ok else 'MISMATCH'}")
+        if not ok:
+            failures.append(path)
+
+    stub = PurgeStub()
+    try:
+        failures += await check_purges(stub)
+    finally:
+        stub.close()
+
+    teambee.hasher.shutdown()
+    teambee.auth.close()
+    if failures:
+        print(f"FAIL: {', '.join(failures)}")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,103 @@
+"""Check that HTML minification doesn't change the rendered DOM.
+
+Renders the homepage in every language, and a page of review slides, with
+and without minification. Both versions are parsed with html5lib (a spec
+compliant parser, ``pip install html5lib``), and the resulting trees must be
+equal apart from whitespace that doesn't render: runs of whitespace count
+as one space, and only whitespace next to block elements is ignored. Also
+prints the size savings.
+"""
+import os
+import re
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+import html5lib
+
+from html_minify import minify_html
+from main import teambee
+
+WHITESPACE = re.compile(r"\s+")
+RAW_TAGS = {"script", "style", "pre", "textarea"}
+# Elements rendered as blocks (or not at all), so whitespace next to them or
+# at the start and end of their content doesn't render. Kept separate from
+# html_minify's list so that a mistake there shows up here.
+BLOCK_TAGS = {
+    "address", "article", "aside", "base", "blockquote", "body", "br", "dd", "details", "dialog",
+    "div", "dl", "dt", "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3",
+    "h4", "h5", "h6", "head", "header", "hr", "html", "li", "link", "main", "meta", "nav",
+    "noscript", "ol", "option", "p", "script", "section", "style", "table", "tbody", "td",
+    "template", "tfoot", "th", "thead", "title", "tr", "ul",
+}
+
+
+def normalize(element, raw=False):
+    """Convert an ElementTree element into a comparable nested tuple.
+
+    Whitespace runs collapse to a single space but are kept wherever they
+    can render, so a space dropped between inline siblings is a difference.
+    """
+    tag = element.tag.split("}")[-1]
+    raw = raw or tag in RAW_TAGS
+    children = []
+
+    def add_text(text):
+        if not text:
+            return
+        if not raw:
+            text = WHITESPACE.sub(" ", text)
+        if children and isinstance(children[-1], str):
+            children[-1] = WHITESPACE.sub(" ", children[-1] + text) if not raw else children[-1] + text
+        else:
+            children.append(text)
+
+    add_text(element.text)
+    for child in element:
+        children.append(normalize(child, raw))
+        add_text(child.tail)
+
+    if not raw:
+        # Drop the whitespace that doesn't render: at the edges of a block
+        # and next to a block child
+        for i, child in enumerate(children):
+            if not isinstance(child, str):
+                continue
+            if (i == 0 and tag in BLOCK_TAGS) or (i > 0 and children[i - 1][0] in BLOCK_TAGS):
+                child = child.lstrip(" ")
+            if (i == len(children) - 1 and tag in BLOCK_TAGS) or (i < len(children) - 1 and children[i + 1][0] in BLOCK_TAGS):
+                child = child.rstrip(" ")
+            children[i] = child
+        children = [child for child in children if child != ""]
+    return (tag, tuple(sorted(element.attrib.items())), tuple(children))
+
+
+def compare(name, html):
+    """Compare the DOM of `html` and its minified version, return True if equal."""
+    minified = minify_html(html)
+    parse = html5lib.parseFragment if not html.lstrip().lower().startswith("<!doctype") else html5lib.parse
+    original_tree = normalize(parse(html, namespaceHTMLElements=False))
+    minified_tree = normalize(parse(minified, namespaceHTMLElements=False))
+    saved = 1 - len(minified.encode()) / len(html.encode())
+    status = "OK" if original_tree == minified_tree else "MISMATCH"
+    print(f"{name:<24} {len(html.encode()):>8} -> {len(minified.encode()):>8} bytes ({saved:.1%} smaller)  {status}")
+    return original_tree == minified_tree
+
+
+def main():
+    teambee.minify_pages = False
+    snapshot = teambee.content.snapshot
+    ok = True
+    for path, lang in teambee.prerender_pages:
+        request = teambee._synthetic_request(path, lang, snapshot)
+        ok &= compare(f"page {path} ({lang})", teambee.render_page(request))
+        teambee.request = request
+        snapshot.review_fragments.clear()
+        ok &= compare(f"review slides ({lang})", teambee.render_review_slides(0))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""Check that contact form submissions stay fast during a spike.
+
+Submits the contact form one request at a time, first on a quiet server and
+then while a spike of SPIKE submissions arrives at SPIKE_RATE per second,
+with a notifier that takes NOTIFY_DELAY seconds per batch. Submissions only
+queue the lead, so storing and sending the spike in the background
+shouldn't slow them down: fails when the p95 grows more than MAX_P95_RATIO
+times, or when a lead gets lost. Requests are sent to the ASGI app
+in-process (see burst_bench.py), so no server is needed:
+``python scripts/contact_burst_bench.py``.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+os.environ["AUTH_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "auth.db")
+os.environ["LEADS_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "leads.db")
+
+from main import app, teambee
+from leads import MemoryNotifier
+
+from burst_bench import call, latencies, report
+
+SPIKE = 300
+SPIKE_RATE = 200
+SUBMISSIONS = 100
+NOTIFY_DELAY = 0.5
+FORM = b"name=Bench+User&email=bench%40example.com&club=Bench+Gym&message=Hello"
+HEADERS = [
+    (b"content-type", b"application/x-www-form-urlencoded"),
+    (b"accept", b"application/json"),
+]
+# How much the submission p95 may grow during the spike
+MAX_P95_RATIO = 3
+
+
+async def submit():
+    """Submit the contact form once and return its status code."""
+    return await call(app, "/contact", "POST", FORM, HEADERS)
+
+
+async def submit_latencies():
+    """Submit the form SUBMISSIONS times, one after the other."""
+    return await latencies(submit, SUBMISSIONS, expected=202)
+
+
+async def during_spike():
+    """Submission latencies while a spike of submissions is being handled.
+
+    The spike arrives evenly spread; submissions that arrive at the very
+    same moment wait for each other whatever happens in the background.
+    """
+    async def spike():
+        tasks = []
+        start = time.perf_counter()
+        for i in range(SPIKE):
+            tasks.append(asyncio.create_task(submit()))
+            await asyncio.sleep(max(0, start + (i + 1) / SPIKE_RATE - time.perf_counter()))
+        return await asyncio.gather(*tasks)
+
+    stored = teambee.leads.stored
+    spike_task = asyncio.create_task(spike())
+    # Start timing once the background writer is busy with the spike
+    while teambee.leads.stored == stored and not spike_task.done():
+        await asyncio.sleep(0.001)
+    result, failed = await submit_latencies()
+    statuses = await spike_task
+    return result, failed + sum(status != 202 for status in statuses)
+
+
+async def main():
+    teambee.leads.notifier = MemoryNotifier(delay=NOTIFY_DELAY)
+    await teambee.leads.start()
+    await submit_latencies()  # Warm up
+
+    baseline, _, _ = report("submissions alone", await submit_latencies())
+    spiked, _, failed = report(f"during {SPIKE} submissions", await during_spike())
+
+    # Wait for the background writer to catch up
+    total = SPIKE + 3 * SUBMISSIONS
+    deadline = time.perf_counter() + 30
+    while len(teambee.leads.notifier.sent) < total and time.perf_counter() < deadline:
+        await asyncio.sleep(0.1)
+    print(f"stored and sent in the background: {teambee.leads.stats()}")
+
+    await teambee.leads.stop()
+    teambee.hasher.shutdown()
+    teambee.auth.close()
+    if spiked > MAX_P95_RATIO * baseline or failed or len(teambee.leads.notifier.sent) != total:
+        print(f"FAIL: submissions slow down (p95 over {MAX_P95_RATIO}x) or get lost during a spike")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
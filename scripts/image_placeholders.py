@@ -0,0 +1,61 @@
+"""Generate low-quality placeholders for the large photos in public/assets.
+
+For every JPEG of at least MIN_BYTES, a tiny blurred thumbnail (as a data
+URI) and the average color are stored in public/assets/manifest.json. The
+page shows them while the real image loads. Run again after adding or
+replacing photos (needs Pillow, ``pip install pillow``):
+``python scripts/image_placeholders.py``.
+"""
+import base64
+import io
+import json
+import os
+import sys
+
+from PIL import Image, ImageFilter, ImageOps
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSETS_DIR = os.path.join(ROOT, "public", "assets")
+MANIFEST_PATH = os.path.join(ASSETS_DIR, "manifest.json")
+
+MIN_BYTES = 50 * 1024
+THUMBNAIL_SIZE = 16
+JPEG_QUALITY = 60
+
+
+def placeholder(image):
+    """Return the thumbnail data URI and average color of an image."""
+    image = ImageOps.exif_transpose(image).convert("RGB")
+    color = image.resize((1, 1), Image.Resampling.BOX).getpixel((0, 0))
+
+    thumbnail = image.copy()
+    thumbnail.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+    thumbnail = thumbnail.filter(ImageFilter.GaussianBlur(1))
+    buffer = io.BytesIO()
+    thumbnail.save(buffer, "JPEG", quality=JPEG_QUALITY, optimize=True)
+    data = base64.b64encode(buffer.getvalue()).decode()
+    return f"data:image/jpeg;base64,{data}", "#{:02x}{:02x}{:02x}".format(*color)
+
+
+def main():
+    manifest = {}
+    for file_name in sorted(os.listdir(ASSETS_DIR)):
+        file_path = os.path.join(ASSETS_DIR, file_name)
+        if os.path.splitext(file_name)[1].lower() not in (".jpg", ".jpeg"):
+            continue
+        if os.path.getsize(file_path) < MIN_BYTES:
+            continue
+
+        with Image.open(file_path) as image:
+            data_uri, color = placeholder(image)
+        manifest[file_name] = {"placeholder": data_uri, "color": color}
+        print(f"{file_name}: {len(data_uri)} byte placeholder, {color}")
+
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
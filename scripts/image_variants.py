@@ -0,0 +1,44 @@
+"""Generate the small image variants used by the lite page.
+
+Every JPEG and PNG in public/assets is scaled down to at most MAX_SIZE
+pixels on its longest side and written to public/assets/small under the same
+name. Run again after adding or replacing images (needs Pillow,
+``pip install pillow``): ``python scripts/image_variants.py``.
+"""
+import os
+import sys
+
+from PIL import Image
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSETS_DIR = os.path.join(ROOT, "public", "assets")
+SMALL_DIR = os.path.join(ASSETS_DIR, "small")
+
+MAX_SIZE = 320
+JPEG_QUALITY = 70
+
+
+def main():
+    os.makedirs(SMALL_DIR, exist_ok=True)
+    for file_name in sorted(os.listdir(ASSETS_DIR)):
+        ext = os.path.splitext(file_name)[1].lower()
+        if ext not in (".jpg", ".jpeg", ".png"):
+            continue
+
+        source = os.path.join(ASSETS_DIR, file_name)
+        target = os.path.join(SMALL_DIR, file_name)
+        with Image.open(source) as image:
+            image.thumbnail((MAX_SIZE, MAX_SIZE))
+            if ext == ".png":
+                image.save(target, optimize=True)
+            else:
+                image.convert("RGB").save(target, quality=JPEG_QUALITY, optimize=True, progressive=True)
+
+        before = os.path.getsize(source)
+        after = os.path.getsize(target)
+        print(f"{file_name}: {before / 1024:.0f} KB -> {after / 1024:.0f} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Check that a burst of logins doesn't slow down the homepage.
+
+Requests the (cached) homepage in a steady loop, first on its own and then
+while BURST concurrent logins are hashing passwords, and compares the
+homepage latencies. Fails when the p95 grows more than MAX_P95_RATIO times
+or any page request takes longer than one password check. For reference it
+also runs the burst with hashing done directly on the event loop, which is
+what the hashing pool avoids. Requests are sent to the ASGI app in-process
+(see burst_bench.py), so no server is needed:
+``python scripts/login_burst_bench.py``.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+os.environ["AUTH_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "auth.db")
+
+from main import app, teambee
+
+from burst_bench import call, latencies, report
+
+BURST = 40
+PAGE_REQUESTS = 200
+EMAIL = "bench@example.com"
+PASSWORD = "correct horse battery staple"
+# How much the homepage p95 may grow during the burst
+MAX_P95_RATIO = 2
+
+async def login():
+    body = f"email={EMAIL}&password={PASSWORD.replace(' ', '+')}".encode()
+    headers = [(b"content-type", b"application/x-www-form-urlencoded")]
+    return await call(app, "/login", "POST", body, headers)
+
+
+async def page_latencies():
+    """Request the homepage PAGE_REQUESTS times."""
+    return await latencies(lambda: call(app, "/"), PAGE_REQUESTS)
+
+
+async def during_burst(pooled=True):
+    """Homepage latencies while a burst of logins is being processed."""
+    logins = [asyncio.create_task(login()) for _ in range(BURST)]
+    if pooled:
+        # Let the logins reach the hashing pool first; handling their
+        # requests up to there costs the same with or without it
+        while teambee.hasher.pending < BURST and not all(task.done() for task in logins):
+            await asyncio.sleep(0.001)
+    else:
+        await asyncio.sleep(0)
+    result = await page_latencies()
+    await asyncio.gather(*logins)
+    return result
+
+
+async def main():
+    teambee.auth.set_password(EMAIL, teambee.hasher.hash(PASSWORD))
+    await teambee.prerender(teambee.content.snapshot)
+    await page_latencies()  # Warm up
+
+    # With few cores the hashes compete with the page for CPU time either way
+    print(f"{os.cpu_count()} CPU(s), {teambee.hasher.max_workers} hashing thread(s)")
+    start = time.perf_counter()
+    teambee.hasher.verify(PASSWORD, teambee.auth.password_hash(EMAIL))
+    hash_ms = (time.perf_counter() - start) * 1000
+    print(f"one password check takes {hash_ms:.1f} ms")
+    baseline, _, _ = report("homepage alone", await page_latencies())
+    pooled, pooled_max, failed = report(f"during {BURST} logins (pool)", await during_burst())
+
+    # Hash on the event loop instead, to show what the pool prevents
+    async def verify_inline(password, password_hash):
+        return teambee.hasher.verify(password, password_hash)
+
+    teambee.hasher.verify_async = verify_inline
+    report(f"during {BURST} logins (inline)", await during_burst(pooled=False))
+
+    teambee.hasher.shutdown()
+    teambee.auth.close()
+    # Page latencies stay close to the baseline, and no page request ever
+    # waits for a whole hash
+    if pooled > MAX_P95_RATIO * baseline or pooled_max > hash_ms or failed:
+        print(f"FAIL: logins slow down the homepage (p95 over {MAX_P95_RATIO}x, or max over one hash)")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,272 @@
+"""Check the weight and render cost of the homepage against page_budget.json.
+
+Renders the homepage in every language through TeambeeApp and collects
+every asset it references: the scripts, stylesheet and icon in the head,
+the images, and the data files the page's scripts fetch (such as the
+success stories loaded by success-stories.js). For each page it reports
+the HTML size, the number of requests and how many of them go to other
+hosts, the total transfer size raw, gzip and brotli, the peak memory
+allocated while rendering (tracemalloc) and the render time relative to
+rendering a fixed reference tree on the same machine, and fails if any of
+them exceeds its budget in page_budget.json. The median render time in ms
+is reported too, but not checked, since it depends too much on the machine.
+
+Images and other binary files are counted at their size on disk for every
+encoding, since they aren't compressed again. Assets on other hosts can't be
+measured, so their weight is not in the totals; they are listed, and the
+external_requests budget (0 by default) makes any new one fail the check.
+Brotli sizes need the optional ``brotli`` package (``pip install brotli``);
+without it they are not checked. Assets listed under "exclude" in
+page_budget.json are still requests but left out of the transfer totals;
+public/app.css is listed there until the budgets are measured with a built
+stylesheet (``npm run build:css``, then remove it and run --update). Any
+other missing script or stylesheet fails the check, and --update refuses to
+write budgets while one is missing.
+
+    python scripts/page_budget.py            # check the budgets
+    python scripts/page_budget.py --update   # write current values + headroom
+"""
+import gzip
+import json
+import math
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from html.parser import HTMLParser
+from urllib.parse import unquote, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+os.environ["AUTH_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "auth.db")
+os.environ["LEADS_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "leads.db")
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from fasthtml.common import Div, P, Span, to_xml
+
+from main import teambee
+
+BUDGET_PATH = os.path.join(ROOT, "page_budget.json")
+RENDERS = 20
+# Headroom added to the measured values by --update
+HEADROOM = 0.1
+# Reported but never budgeted; wall-clock times vary too much between machines
+REPORT_ONLY = {"render_ms"}
+# Budgets kept at one decimal rather than rounded up to whole numbers
+FRACTIONAL = {"render_relative"}
+# File types sent compressed
+COMPRESSIBLE = {".html", ".js", ".css", ".json", ".svg", ".txt"}
+# Literal static paths fetched by scripts, e.g. fetch(`/static/data/success_stories.json...`)
+FETCH_PATTERN = re.compile(r"""fetch\(\s*[`'"](/static/[^`'"$?]+)""")
+
+
+class AssetParser(HTMLParser):
+    """Collects the URLs of the scripts, stylesheets, icons and images in a page."""
+
+    def __init__(self):
+        super().__init__()
+        self.assets = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "script" and attrs.get("src"):
+            self.assets.append(("script", attrs["src"]))
+        elif tag == "link" and attrs.get("href") and set((attrs.get("rel") or "").split()) & {"stylesheet", "icon", "preload", "modulepreload"}:
+            self.assets.append(("stylesheet" if "stylesheet" in attrs["rel"] else "link", attrs["href"]))
+        elif tag in ("img", "source"):
+            src = attrs.get("src") or (attrs.get("srcset") or "").split(" ")[0]
+            if src and not src.startswith("data:"):
+                self.assets.append(("image", src))
+
+
+def local_path(url):
+    """File in public/ served at a /static/ URL, or None for other URLs."""
+    path = unquote(urlsplit(url).path)
+    if urlsplit(url).netloc or not path.startswith("/static/"):
+        return None
+    return os.path.join(ROOT, "public", path.removeprefix("/static/"))
+
+
+def sizes(data, compressible):
+    """Raw, gzip and brotli size of a response body."""
+    if not compressible:
+        return len(data), len(data), len(data)
+    return (
+        len(data),
+        len(gzip.compress(data, compresslevel=6)),
+        len(brotli.compress(data)) if brotli else None,
+    )
+
+
+def find_assets(html):
+    """Return (kind, url) of every asset a page loads, in order and without duplicates."""
+    parser = AssetParser()
+    parser.feed(html)
+    assets = list(dict.fromkeys(parser.assets))
+    for kind, url in list(assets):
+        path = local_path(url)
+        if kind == "script" and path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for fetched in FETCH_PATTERN.findall(f.read()):
+                    if ("data", fetched) not in assets:
+                        assets.append(("data", fetched))
+    return assets
+
+
+def measure_render(path, lang):
+    """Render a page without caches.
+
+    Every page render is paired with a render of a fixed reference tree of
+    500 elements, so that the relative render time compares renders made
+    under the same load. Returns the HTML, the median render time in ms, the
+    median ratio to the reference, and the peak KB allocated.
+    """
+    snapshot = teambee.content.snapshot
+    reference = Div(*(P(f"Item {i}", Span("detail"), cls="item") for i in range(500)))
+    timings = []
+    ratios = []
+    for _ in range(RENDERS):
+        start = time.perf_counter()
+        to_xml(reference)
+        reference_time = time.perf_counter() - start
+        request = teambee._synthetic_request(path, lang, snapshot)
+        start = time.perf_counter()
+        html = teambee.render_page(request)
+        render_time = time.perf_counter() - start
+        timings.append(render_time * 1000)
+        ratios.append(render_time / reference_time)
+
+    request = teambee._synthetic_request(path, lang, snapshot)
+    tracemalloc.start()
+    teambee.render_page(request)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return html, statistics.median(timings), statistics.median(ratios), peak / 1024
+
+
+def measure(path, lang, exclude=()):
+    """Measure one page, leaving the assets at the paths in `exclude` out of the totals.
+
+    Returns the metrics, the assets, and the assets that couldn't be measured.
+    """
+    html, render_ms, render_relative, render_peak_kb = measure_render(path, lang)
+    html_raw, html_gzip, html_brotli = sizes(html.encode(), True)
+    totals = [html_raw, html_gzip, html_brotli]
+    unmeasured = []
+
+    assets = find_assets(html)
+    for kind, url in assets:
+        if urlsplit(url).path in exclude:
+            continue
+        file_path = local_path(url)
+        if not file_path or not os.path.isfile(file_path):
+            unmeasured.append((kind, url))
+            continue
+        with open(file_path, "rb") as f:
+            asset_sizes = sizes(f.read(), os.path.splitext(file_path)[1].lower() in COMPRESSIBLE)
+        totals = [None if total is None else total + size for total, size in zip(totals, asset_sizes)]
+
+    metrics = {
+        "html_bytes": html_raw,
+        "html_gzip_bytes": html_gzip,
+        "requests": 1 + len(assets),
+        "external_requests": sum(1 for _, url in assets if not local_path(url)),
+        "transfer_bytes": totals[0],
+        "transfer_gzip_bytes": totals[1],
+        "transfer_brotli_bytes": totals[2],
+        "render_ms": round(render_ms, 2),
+        "render_relative": round(render_relative, 2),
+        "render_peak_kb": round(render_peak_kb, 1),
+    }
+    return metrics, assets, unmeasured
+
+
+def main():
+    update = "--update" in sys.argv[1:]
+    with open(BUDGET_PATH, encoding="utf-8") as f:
+        budget = json.load(f)
+
+    exclude = set(budget.get("exclude", []))
+    failures = []
+    missing = []
+    measured = {}
+    for path, lang in teambee.prerender_pages:
+        metrics, assets, unmeasured = measure(path, lang, exclude)
+        measured[path] = metrics
+        page_budget = budget.get("pages", {}).get(path, {})
+        print(f"page {path} ({lang}): {len(assets)} assets")
+        for name, value in metrics.items():
+            limit = None if name in REPORT_ONLY else page_budget.get(name)
+            if value is None:
+                status = "not measured"
+            elif name in REPORT_ONLY:
+                status = "report only"
+            elif limit is None:
+                status = "no budget"
+            elif value > limit:
+                status = "OVER BUDGET"
+                failures.append(f"{path} {name}")
+            else:
+                status = "OK"
+            limit_text = "-" if limit is None else limit
+            print(f"  {name:<22} {'-' if value is None else value:>12}  budget {limit_text:>12}  {status}")
+        for kind, url in unmeasured:
+            if not local_path(url):
+                # Still a request, and weight the totals don't include
+                print(f"  external {kind}, not measured: {url}")
+            elif kind == "image":
+                # A broken image adds no weight, but should be fixed
+                print(f"  missing image (404): {url}")
+            else:
+                # Missing scripts or styles would make the page look lighter than it is
+                print(f"  missing {kind}: {url}")
+                missing.append(f"{path} {url}")
+        for kind, url in assets:
+            if urlsplit(url).path in exclude:
+                print(f"  {kind} left out of the transfer totals: {url}")
+
+    if brotli is None:
+        print("brotli is not installed; brotli sizes are not checked (pip install brotli)")
+
+    if update and missing:
+        print("Not updating the budgets: they would be measured without the missing files")
+    elif update:
+        for path, metrics in measured.items():
+            page_budget = budget.setdefault("pages", {}).setdefault(path, {})
+            for name, value in metrics.items():
+                if value is None or name in REPORT_ONLY:
+                    continue
+                if name in FRACTIONAL:
+                    page_budget[name] = math.ceil(value * (1 + HEADROOM) * 10) / 10
+                else:
+                    page_budget[name] = math.ceil(value * (1 + HEADROOM))
+        with open(BUDGET_PATH, "w", encoding="utf-8") as f:
+            json.dump(budget, f, indent=2)
+            f.write("\n")
+        print(f"Updated {os.path.relpath(BUDGET_PATH, ROOT)}")
+        # The budgets now fit the measured values
+        failures = []
+
+    teambee.hasher.shutdown()
+    teambee.auth.close()
+    if missing:
+        print(f"FAIL: missing files, build them first (npm run build:css): {', '.join(missing)}")
+        return 1
+    if failures:
+        print(f"FAIL: over budget: {', '.join(failures)}")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
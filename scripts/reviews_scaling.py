@@ -0,0 +1,78 @@
+"""Synthetic scaling check for the windowed reviews carousel.
+
+Generates review sets of increasing size, renders the homepage for each and
+verifies that HTML size and render time stay flat as the number of reviews
+grows. Run from anywhere with ``python scripts/reviews_scaling.py``.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+from main import teambee
+
+SIZES = [6, 100, 1000, 5000]
+ROUNDS = 20
+# Allowed growth between the smallest and largest review set
+MAX_SIZE_RATIO = 1.05
+MAX_TIME_RATIO = 1.5
+
+
+def make_reviews(count):
+    """Generate `count` synthetic reviews in the reviews.json format."""
+    return [
+        {
+            "quote": {
+                "nl": f"\"Review {i}: Teambee heeft onze club geholpen om leden beter te begeleiden.\"",
+                "en": f"\"Review {i}: Teambee helped our club guide members better.\""
+            },
+            "author": {"nl": f"Auteur {i}", "en": f"Author {i}"},
+            "title": {"nl": f"Eigenaar, Club {i}", "en": f"Owner, Club {i}"}
+        }
+        for i in range(count)
+    ]
+
+
+def measure(path, lang):
+    """Return (html bytes, median render seconds) for an uncached page render."""
+    request = teambee._synthetic_request(path, lang, teambee.content.snapshot)
+    size = len(teambee.render_page(request).encode())
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        teambee.render_page(request)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return size, timings[len(timings) // 2]
+
+
+def main():
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in SIZES:
+            path = os.path.join(tmp, f"reviews-{count}.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(make_reviews(count), f)
+            teambee.content.data_files["reviews"] = path
+            teambee.content.reload()
+            size, seconds = measure("/", "nl")
+            results.append((count, size, seconds))
+            print(f"{count:>6} reviews  {size:>8} bytes  {seconds * 1000:8.2f} ms")
+
+    size_ratio = results[-1][1] / results[0][1]
+    time_ratio = results[-1][2] / results[0][2]
+    print(f"size ratio {size_ratio:.3f}, time ratio {time_ratio:.3f}")
+    if size_ratio > MAX_SIZE_RATIO or time_ratio > MAX_TIME_RATIO:
+        print("FAIL: reviews section does not scale flat")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
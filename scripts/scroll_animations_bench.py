@@ -0,0 +1,68 @@
+"""Run the scroll animation benchmark page in headless Chrome.
+
+Loads scripts/bench/scroll-animations.html once with the previous
+per-scroll engine and once with public/js/scroll-animations.js, and prints
+the scroll handler cost per frame for both. Set CHROME to the browser binary
+if it is not on the PATH.
+"""
+import json
+import os
+import pathlib
+import re
+import shutil
+import subprocess
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+PAGE = ROOT / "scripts" / "bench" / "scroll-animations.html"
+CANDIDATES = ["chromium", "chromium-browser", "google-chrome", "google-chrome-stable", "chrome"]
+
+
+def find_chrome():
+    """Return the path of a Chrome/Chromium binary, or None."""
+    if os.environ.get("CHROME"):
+        return os.environ["CHROME"]
+    for name in CANDIDATES:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def run(chrome, mode):
+    """Run the benchmark page in one mode and return its results."""
+    url = f"{PAGE.as_uri()}?mode={mode}"
+    output = subprocess.run(
+        [
+            chrome, "--headless=new", "--disable-gpu", "--no-sandbox",
+            "--allow-file-access-from-files", "--window-size=1280,800",
+            "--virtual-time-budget=20000", "--dump-dom", url,
+        ],
+        capture_output=True, text=True, timeout=120, check=True,
+    ).stdout
+    match = re.search(r'<pre id="results">(.*?)</pre>', output, re.S)
+    if not match or match.group(1) == "running":
+        raise RuntimeError(f"benchmark did not finish in {mode} mode")
+    return json.loads(match.group(1))
+
+
+def main():
+    chrome = find_chrome()
+    if chrome is None:
+        print("Chrome/Chromium not found; set CHROME or open the page manually:")
+        print(f"  {PAGE.as_uri()}?mode=legacy")
+        print(f"  {PAGE.as_uri()}?mode=observer")
+        return 1
+
+    results = [run(chrome, mode) for mode in ("legacy", "observer")]
+    for result in results:
+        print(
+            f"{result['mode']:>9}: {result['handler_ms_per_frame']:.4f} ms/frame in handlers "
+            f"({result['handler_calls']} calls), frame p50 {result['frame_ms_p50']} ms, "
+            f"p95 {result['frame_ms_p95']} ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""Synthetic scaling check for the review and success story search.
+
+Generates corpora of increasing size from the words of the real reviews and
+success stories, builds a search index for each and times lookups of sample
+queries, as well as the update after one document changes, which should
+only index that document again. Lookups score every document in the posting
+lists of the query terms, so they grow with the corpus; up to BUDGET_DOCS
+documents (ten times the real content) they must stay within
+LOOKUP_BUDGET_MS at the median and at the 95th percentile. Larger corpora
+are only reported. Run from anywhere with
+``python scripts/search_scaling.py [sizes...]``.
+"""
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+from search_index import SearchIndex, tokenize
+
+SIZES = [10, 100, 1000, 10000]
+LANG = "en"
+ROUNDS = 200
+LOOKUP_BUDGET_MS = 1.0
+BUDGET_DOCS = 100
+QUERIES = ["squash", "physio fitness", "member growth", "boutique studio", "retention app", "personal trainer"]
+
+
+def vocabulary():
+    """Return the words of the real content in LANG, most frequent first."""
+    def texts(value):
+        if isinstance(value, dict):
+            if LANG in value:
+                yield str(value[LANG])
+            else:
+                for item in value.values():
+                    yield from texts(item)
+        elif isinstance(value, list):
+            for item in value:
+                yield from texts(item)
+
+    counts = {}
+    for name in ["reviews", "success_stories"]:
+        with open(os.path.join(ROOT, "public", "data", f"{name}.json"), encoding="utf-8") as f:
+            data = json.load(f)
+        for text in texts(data):
+            for term in tokenize(text, LANG):
+                counts[term] = counts.get(term, 0) + 1
+    return sorted(counts, key=counts.get, reverse=True)
+
+
+def make_corpus(count, words, seed=0):
+    """Generate `count` synthetic documents with Zipf-distributed words."""
+    rng = random.Random(seed)
+    # Word i is picked with a weight of 1 / (i + 1), like in natural text
+    weights = [1 / (i + 1) for i in range(len(words))]
+
+    def sentence(length):
+        return " ".join(rng.choices(words, weights, k=length))
+
+    docs = {}
+    for i in range(count):
+        kind = "case" if i % 5 == 0 else "review"
+        docs[f"{kind}:{i}"] = {
+            "kind": kind,
+            "title": f"Club {i} {sentence(2)}",
+            "subtitle": sentence(4),
+            "body": sentence(rng.randint(40, 120)),
+        }
+    return docs
+
+
+def lookup_times(index, rounds):
+    """Sorted lookup times in ms over all sample queries."""
+    timings = []
+    for _ in range(rounds):
+        for query in QUERIES:
+            start = time.perf_counter()
+            index.search(LANG, query)
+            timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or SIZES
+    words = vocabulary()
+    failed = False
+    for count in sizes:
+        docs = make_corpus(count, words)
+        start = time.perf_counter()
+        index, indexed = SearchIndex().updated({LANG: docs})
+        full = time.perf_counter() - start
+
+        # Change one document; only that one should be indexed again
+        changed = dict(docs)
+        doc_id = next(iter(changed))
+        changed[doc_id] = dict(changed[doc_id], body=changed[doc_id]["body"] + " squash")
+        start = time.perf_counter()
+        updated, reindexed = index.updated({LANG: changed})
+        update = time.perf_counter() - start
+
+        timings = lookup_times(updated, ROUNDS)
+        p50 = timings[len(timings) // 2]
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        terms = updated.stats()[LANG]["terms"]
+        print(
+            f"{count:>6} docs {terms:>5} terms  build {full * 1000:7.1f} ms  "
+            f"update {update * 1000:6.1f} ms ({reindexed} indexed)  "
+            f"lookup p50 {p50:6.3f} ms  p95 {p95:6.3f} ms"
+        )
+        if indexed != count or reindexed != 1:
+            failed = True
+        if count <= BUDGET_DOCS and (p50 > LOOKUP_BUDGET_MS or p95 > LOOKUP_BUDGET_MS):
+            failed = True
+
+    if failed:
+        print(f"FAIL: updates index unchanged documents or lookups exceed {LOOKUP_BUDGET_MS} ms")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+"""Create a client portal user or change their password.
+
+Usage: ``python scripts/set_password.py <email>``; the password is asked for
+interactively. Uses the database in AUTH_DB_PATH (default auth.db).
+"""
+import getpass
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+from auth import AuthStore, PasswordHasher
+
+
+def main():
+    if len(sys.argv) != 2:
+        print(__doc__.strip())
+        return 1
+
+    password = getpass.getpass("Password: ")
+    if password != getpass.getpass("Repeat password: "):
+        print("Passwords don't match")
+        return 1
+
+    hasher = PasswordHasher()
+    store = AuthStore(os.environ.get("AUTH_DB_PATH", "auth.db"))
+    store.set_password(sys.argv[1], hasher.hash(password))
+    store.close()
+    hasher.shutdown()
+    print(f"Password set for {sys.argv[1]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+"""Download FastHTML's default scripts into public/vendor.
+
+Vendoring is opt-in: until this is run, public/vendor/manifest.json is empty
+and the scripts named in ``FRAMEWORK_SCRIPTS`` (none by default) are loaded
+from their CDN. Each download must match its SHA-384 digest in
+``VENDOR_DIGESTS``; it is then stored under a content-hashed file name and
+recorded in the manifest, which the app reads at startup. Run again after
+upgrading a script and its pinned digest, optionally naming the scripts to
+fetch: ``python scripts/vendor_scripts.py [htmx]``.
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from vendor import VENDOR_DIGESTS, VendorScripts
+
+
+def main():
+    names = sys.argv[1:] or list(VENDOR_DIGESTS)
+    unknown = [name for name in names if name not in VENDOR_DIGESTS]
+    if unknown:
+        print(f"Can't vendor: {', '.join(unknown)} (only scripts with a pinned digest: {', '.join(VENDOR_DIGESTS)})")
+        return 1
+
+    VendorScripts(os.path.join(ROOT, "public", "vendor")).fetch(names)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
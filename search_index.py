@@ -0,0 +1,192 @@
+import heapq
+import math
+import re
+import unicodedata
+from bisect import bisect_left, insort
+
+# Words too common to be worth indexing
+STOPWORDS = {
+    "en": {
+        "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is",
+        "it", "of", "on", "our", "that", "the", "this", "to", "was", "we", "with",
+    },
+    "nl": {
+        "aan", "als", "bij", "dat", "de", "die", "door", "een", "en", "er", "het", "in", "is", "met",
+        "naar", "nog", "om", "onze", "ons", "ook", "op", "te", "tot", "uit", "van", "voor", "we", "wij", "zijn",
+    },
+}
+
+# Relative weight of a term in each indexed field
+FIELD_WEIGHTS = {"title": 3.0, "subtitle": 2.0, "body": 1.0}
+
+
+def tokenize(text, lang=None):
+    """Split text into lowercase, accent-free search terms."""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode().lower()
+    stopwords = STOPWORDS.get(lang, ())
+    return [term for term in re.findall(r"[a-z0-9]+", text) if len(term) > 1 and term not in stopwords]
+
+
+class LanguageIndex:
+    """BM25-ranked inverted index over the documents of one language.
+
+    Never modified once built: `updated` returns a new index that shares the
+    posting lists of all terms the changed documents don't use, so lookups
+    can keep running on the old index while an update is being built.
+    """
+
+    # BM25 parameters
+    k1 = 1.2
+    b = 0.75
+
+    # Weight of terms matched by prefix only, and how many of them are used
+    prefix_weight = 0.5
+    max_prefix_terms = 20
+
+    def __init__(self, lang):
+        """Initialize an empty index."""
+        self.lang = lang
+        # term -> {doc_id: weighted term frequency}
+        self.postings = {}
+        # doc_id -> (document, indexed terms)
+        self.docs = {}
+        # doc_id -> weighted length
+        self.lengths = {}
+        self.total_length = 0.0
+        # All terms, sorted for prefix lookups
+        self.terms = []
+
+    def _term_weights(self, doc):
+        weights = {}
+        for field, field_weight in FIELD_WEIGHTS.items():
+            for term in tokenize(doc.get(field, ""), self.lang):
+                weights[term] = weights.get(term, 0.0) + field_weight
+        return weights
+
+    def updated(self, docs):
+        """Return an index of `docs` (doc_id -> document) built from this one.
+
+        Only documents that were added, removed or changed are tokenized
+        again, but the tables of the index are copied, so an update takes
+        time linear in the size of the index. Returns the new index and the
+        number of documents indexed.
+        """
+        index = LanguageIndex(self.lang)
+        index.postings = dict(self.postings)
+        index.docs = dict(self.docs)
+        index.lengths = dict(self.lengths)
+        index.total_length = self.total_length
+        copied = set()
+
+        def posting(term):
+            # Copy a posting list before changing it; the old index still uses it
+            if term not in copied:
+                index.postings[term] = dict(index.postings.get(term, ()))
+                copied.add(term)
+            return index.postings[term]
+
+        for doc_id, (doc, terms) in self.docs.items():
+            if docs.get(doc_id) == doc:
+                continue
+            for term in terms:
+                del posting(term)[doc_id]
+            index.total_length -= index.lengths.pop(doc_id)
+            del index.docs[doc_id]
+
+        indexed = 0
+        for doc_id, doc in docs.items():
+            if doc_id in index.docs:
+                continue
+            weights = self._term_weights(doc)
+            for term, weight in weights.items():
+                posting(term)[doc_id] = weight
+            index.docs[doc_id] = (doc, tuple(weights))
+            index.lengths[doc_id] = sum(weights.values())
+            index.total_length += index.lengths[doc_id]
+            indexed += 1
+
+        index.terms = self.terms
+        if copied:
+            index.terms = list(self.terms)
+            for term in copied:
+                if not index.postings[term]:
+                    del index.postings[term]
+                    del index.terms[bisect_left(index.terms, term)]
+                elif term not in self.postings:
+                    insort(index.terms, term)
+
+        return index, indexed
+
+    def _expand(self, token, prefix=False):
+        """Index terms a query token matches, with their weight."""
+        matches = []
+        if token in self.postings:
+            matches.append((token, 1.0))
+        if prefix and len(token) >= 3:
+            i = bisect_left(self.terms, token)
+            while i < len(self.terms) and len(matches) <= self.max_prefix_terms and self.terms[i].startswith(token):
+                if self.terms[i] != token:
+                    matches.append((self.terms[i], self.prefix_weight))
+                i += 1
+        return matches
+
+    def search(self, query, limit=10):
+        """Return up to `limit` (score, document) pairs, best first."""
+        if not self.docs or limit <= 0:
+            return []
+        count = len(self.docs)
+        average_length = self.total_length / count or 1.0
+        tokens = tokenize(query, self.lang)
+        # Only the last word can still be being typed, so only it matches
+        # by prefix
+        last = tokens[-1] if tokens and not query[-1:].isspace() else None
+        scores = {}
+        for token in set(tokens):
+            # A document scores a query word by its best matching term
+            word_scores = {}
+            for term, weight in self._expand(token, prefix=token == last):
+                postings = self.postings[term]
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self.lengths[doc_id] / average_length)
+                    score = weight * idf * tf * (self.k1 + 1) / (tf + norm)
+                    if score > word_scores.get(doc_id, 0.0):
+                        word_scores[doc_id] = score
+            for doc_id, score in word_scores.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + score
+
+        top = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(score, self.docs[doc_id][0]) for doc_id, score in top]
+
+
+class SearchIndex:
+    """Search indexes for all languages, replaced as a whole on updates."""
+
+    def __init__(self, indexes=None):
+        """Initialize the index from per-language indexes."""
+        self.indexes = indexes or {}
+
+    def updated(self, documents):
+        """Return an index of `documents` (lang -> doc_id -> document) built from this one.
+
+        Returns the new index and the number of documents indexed.
+        """
+        indexes = {}
+        indexed = 0
+        for lang, docs in documents.items():
+            index = self.indexes.get(lang) or LanguageIndex(lang)
+            indexes[lang], count = index.updated(docs)
+            indexed += count
+        return SearchIndex(indexes), indexed
+
+    def search(self, lang, query, limit=10):
+        """Return up to `limit` (score, document) pairs in `lang`, best first."""
+        index = self.indexes.get(lang)
+        return index.search(query, limit) if index else []
+
+    def stats(self):
+        """Return the number of documents and terms per language."""
+        return {
+            lang: {"documents": len(index.docs), "terms": len(index.postings)}
+            for lang, index in self.indexes.items()
+        }
@@ -0,0 +1,46 @@
+import asyncio
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into a single execution.
+
+    The first caller for a key starts the work; callers arriving while it is
+    still running await the same result instead of repeating the work.
+    """
+
+    def __init__(self):
+        """Initialize an empty set of in-flight calls."""
+        self._inflight = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def start(self, key, func):
+        """Join or start the call for `key`.
+
+        Returns the task producing the result and whether this caller started
+        it. Registration happens immediately, before the task first runs.
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return task, False
+
+        self.calls += 1
+        # Run as its own task so a cancelled caller doesn't cancel the others
+        task = asyncio.ensure_future(func())
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return task, True
+
+    async def do(self, key, func):
+        """Return the result of `await func()`, shared by concurrent callers."""
+        task, _ = self.start(key, func)
+        return await asyncio.shield(task)
+
+    def stats(self):
+        """Return the coalescing counters."""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
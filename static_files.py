@@ -0,0 +1,123 @@
+import os
+from collections import OrderedDict
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+from cdn import surrogate_headers
+
+
+class CachedStaticFiles(StaticFiles):
+    """Static files with the small, frequently requested ones kept in memory.
+
+    Files up to `max_file_size` bytes are cached with their response headers
+    in an LRU bounded by `max_bytes`, so a hit neither stats nor opens the
+    file. The cache is never revalidated against the disk; call `clear()`
+    when the files change. Larger files, and range requests, are served from
+    disk by `FileResponse`, which sends them zero-copy when the server
+    supports the ASGI pathsend extension. `surrogate_keys`, if given, maps a
+    file's path below the mount point to the CDN surrogate keys it is tagged
+    with.
+    """
+
+    # Set by subclasses to add a Cache-Control header to every file
+    cache_control = None
+
+    # Chunk size for large files when they are streamed from disk
+    large_chunk_size = 256 * 1024
+
+    def __init__(self, *args, max_file_size=64 * 1024, max_bytes=8 * 1024 * 1024, surrogate_keys=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.surrogate_keys = surrogate_keys
+        self.max_file_size = max_file_size
+        self.max_bytes = max_bytes
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if self.cache_control:
+            response.headers["Cache-Control"] = self.cache_control
+        if self.surrogate_keys:
+            path = self.get_path(scope).replace(os.sep, "/")
+            response.headers.update(surrogate_headers(self.surrogate_keys(path)))
+        if stat_result.st_size > self.max_file_size:
+            response.chunk_size = self.large_chunk_size
+        return response
+
+    async def get_response(self, path, scope):
+        if scope["method"] not in ("GET", "HEAD"):
+            raise HTTPException(status_code=405, headers={"Allow": "GET, HEAD"})
+
+        request_headers = Headers(scope=scope)
+        if "range" in request_headers:
+            # FileResponse implements single and multipart ranges and If-Range
+            return await super().get_response(path, scope)
+
+        entry = self._cache.get(path)
+        # Reported in the access log
+        scope.setdefault("state", {})["cache"] = "miss" if entry is None else "hit"
+        if entry is None:
+            self.misses += 1
+            response = await super().get_response(path, scope)
+            entry = await self._store(path, response)
+            if entry is None:
+                return response
+        else:
+            self.hits += 1
+            self._cache.move_to_end(path)
+
+        body, headers = entry
+        if self.is_not_modified(Headers(headers), request_headers):
+            return NotModifiedResponse(Headers(headers))
+        # Content-Length is already in the headers, so it stays right for HEAD
+        return Response(b"" if scope["method"] == "HEAD" else body, headers=headers)
+
+    async def _store(self, path, response):
+        """Cache a small file response, returning the cache entry or None."""
+        if type(response) is not FileResponse or response.status_code != 200:
+            return None
+        size = response.stat_result.st_size
+        if size > self.max_file_size or size > self.max_bytes:
+            return None
+
+        body = await anyio.to_thread.run_sync(self._read, response.path)
+        if len(body) != size:
+            # Changed since it was looked up; serve it from disk this time
+            return None
+
+        entry = (body, dict(response.headers))
+        self._cache[path] = entry
+        self._cache_bytes += size
+        while self._cache_bytes > self.max_bytes:
+            _, (old_body, _) = self._cache.popitem(last=False)
+            self._cache_bytes -= len(old_body)
+        return entry
+
+    @staticmethod
+    def _read(file_path):
+        with open(file_path, "rb") as f:
+            return f.read()
+
+    def is_cached(self, path):
+        """Check whether a path below the mount point is served from memory."""
+        return os.path.normpath(os.path.join(*path.split("/"))) in self._cache
+
+    def clear(self):
+        """Forget all cached files."""
+        self._cache.clear()
+        self._cache_bytes = 0
+
+    def stats(self):
+        """Return the cache counters."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "files": len(self._cache),
+            "bytes": self._cache_bytes,
+        }
@@ -0,0 +1,129 @@
+import base64
+import hashlib
+import json
+import os
+import urllib.request
+from urllib.parse import urlsplit
+
+from fasthtml.common import Script
+from starlette.exceptions import HTTPException
+
+from static_files import CachedStaticFiles
+
+# FastHTML's default scripts, by the name used in the manifest. URLs are
+# pinned to releases so a vendored copy can be fetched again byte for byte;
+# css-scope-inline has no release to pin to and isn't offered
+VENDOR_SCRIPTS = {
+    "htmx": "https://cdn.jsdelivr.net/npm/htmx.org@2.0.3/dist/htmx.js",
+    "fasthtml": "https://cdn.jsdelivr.net/gh/answerdotai/fasthtml-js@1.0.12/fasthtml.js",
+    "surreal": "https://cdn.jsdelivr.net/gh/answerdotai/surreal@1.3.0/surreal.js",
+}
+
+# SHA-384 digests (as used for subresource integrity) the downloads must
+# match. Scripts without one can't be vendored, only loaded from their CDN.
+VENDOR_DIGESTS = {
+    "htmx": "sha384-BBDmZzVt6vjz5YbQqZPtFZW82o8QotoM7RUp5xOxV3nSJ8u2pSdtzFAbGKzTlKtg",
+}
+
+# Branch names that move, so URLs using them aren't reproducible
+MOVING_REFS = {"main", "master", "latest"}
+
+MANIFEST_NAME = "manifest.json"
+
+
+class VendorScripts:
+    """Self-hosted copies of third-party scripts.
+
+    Each script is stored as `<name>.<hash>.js` next to a manifest mapping
+    names to file names. Since a file name changes whenever its contents
+    do, the files can be cached forever. Scripts that have not been
+    vendored yet are loaded from their CDN instead.
+    """
+
+    def __init__(self, directory, url_prefix="/static/vendor"):
+        """Initialize from the manifest in `directory`, if there is one."""
+        self.directory = directory
+        self.url_prefix = url_prefix
+        self.manifest = {}
+        manifest_path = os.path.join(directory, MANIFEST_NAME)
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError as e:
+            print(f"Error loading {manifest_path}: {e}")
+
+    def url(self, name):
+        """URL of a script: our own copy if there is one, its CDN otherwise."""
+        file_name = self.manifest.get(name)
+        if file_name and os.path.exists(os.path.join(self.directory, file_name)):
+            return f"{self.url_prefix}/{file_name}"
+        return VENDOR_SCRIPTS[name]
+
+    def scripts(self, names):
+        """Script elements for the given script names, in order."""
+        return [
+            Script(src=self.url(name), integrity=VENDOR_DIGESTS[name], crossorigin="anonymous")
+            if name in VENDOR_DIGESTS else Script(src=self.url(name))
+            for name in names
+        ]
+
+    def external_origins(self, names):
+        """Origins the given scripts are still loaded from, for the CSP."""
+        origins = []
+        for name in names:
+            url = self.url(name)
+            if url.startswith("https://"):
+                parts = urlsplit(url)
+                origin = f"{parts.scheme}://{parts.netloc}"
+                if origin not in origins:
+                    origins.append(origin)
+        return origins
+
+    def fetch(self, names=None):
+        """Download the scripts, check their digests, store them under their content hash and update the manifest."""
+        names = names or list(VENDOR_DIGESTS)
+        for name in names:
+            ref = urlsplit(VENDOR_SCRIPTS[name]).path.partition("@")[2].split("/")[0]
+            if not ref or ref in MOVING_REFS:
+                raise ValueError(f"{name} is not pinned to a version: {VENDOR_SCRIPTS[name]}")
+            if name not in VENDOR_DIGESTS:
+                raise ValueError(f"{name} has no pinned digest in VENDOR_DIGESTS")
+
+        os.makedirs(self.directory, exist_ok=True)
+        for name in names:
+            with urllib.request.urlopen(VENDOR_SCRIPTS[name], timeout=30) as response:
+                content = response.read()
+            digest = "sha384-" + base64.b64encode(hashlib.sha384(content).digest()).decode()
+            if digest != VENDOR_DIGESTS[name]:
+                raise ValueError(f"{name} doesn't match its pinned digest: got {digest}")
+            file_name = f"{name}.{hashlib.sha256(content).hexdigest()[:12]}.js"
+            with open(os.path.join(self.directory, file_name), "wb") as f:
+                f.write(content)
+
+            # Remove the copy this one replaces
+            previous = self.manifest.get(name)
+            if previous and previous != file_name:
+                try:
+                    os.remove(os.path.join(self.directory, previous))
+                except FileNotFoundError:
+                    pass
+            self.manifest[name] = file_name
+            print(f"Vendored {name} as {file_name}")
+
+        with open(os.path.join(self.directory, MANIFEST_NAME), "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+
+class ImmutableStaticFiles(CachedStaticFiles):
+    """Static files whose names change with their contents, cached for a year."""
+
+    cache_control = "public, max-age=31536000, immutable"
+
+    async def get_response(self, path, scope):
+        # The manifest is only read by the app, and its name has no hash
+        if path == MANIFEST_NAME:
+            raise HTTPException(status_code=404)
+        return await super().get_response(path, scope)